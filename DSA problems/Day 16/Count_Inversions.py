@@ -2,6 +2,7 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.widgets import Button
 from matplotlib.patches import FancyArrowPatch
+import numpy as np
 import time
 
 # Animation tuning (slow & visible)
@@ -91,6 +92,222 @@ class MergeRecorderClassroom:
         hint = f"Added {inv} inversion(s) in this merge" if inv else "No inversions in this merge"
         return merged, inv, seq, hint
 
+# ----------------------------------------------------------
+# Offline range queries: inversions inside many [l, r] slices
+# (Mo's ordering + Fenwick tree, O((n + Q)·√n·log n))
+# ----------------------------------------------------------
+# ranges up to this length are counted directly by the NumPy path
+SMALL_RANGE = 64
+
+class FenwickTree:
+    def __init__(self, n):
+        self.n = n
+        self.tree = [0] * (n + 1)
+
+    def add(self, i, delta):
+        # i is a 1-based rank
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        # how many stored values have rank <= i
+        s = 0
+        while i > 0:
+            s += self.tree[i]
+            i -= i & -i
+        return s
+
+def _compress_ranks(arr):
+    # equal values share a rank so they never count as an inversion
+    order = {v: r + 1 for r, v in enumerate(sorted(set(arr)))}
+    return [order[v] for v in arr], len(order)
+
+def _mo_order(queries, n):
+    block = max(1, int(n ** 0.5))
+    # odd blocks sweep r backwards so the right pointer zig-zags
+    return sorted(range(len(queries)),
+                  key=lambda q: (queries[q][0] // block,
+                                 queries[q][1] if (queries[q][0] // block) % 2 == 0 else -queries[q][1]))
+
+def _mo_sweep(ranks, m, queries, order, answers):
+    bit = FenwickTree(m)
+    cl, cr = 0, -1     # current window [cl, cr], empty at start
+    size = 0
+    inv = 0
+    for q in order:
+        l, r = queries[q]
+        # grow first, then shrink, so the window never goes negative
+        while cr < r:
+            cr += 1
+            x = ranks[cr]
+            inv += size - bit.prefix(x)      # window values greater than x
+            bit.add(x, 1); size += 1
+        while cl > l:
+            cl -= 1
+            x = ranks[cl]
+            inv += bit.prefix(x - 1)         # window values smaller than x
+            bit.add(x, 1); size += 1
+        while cr > r:
+            x = ranks[cr]
+            bit.add(x, -1); size -= 1
+            inv -= size - bit.prefix(x)
+            cr -= 1
+        while cl < l:
+            x = ranks[cl]
+            bit.add(x, -1); size -= 1
+            inv -= bit.prefix(x - 1)
+            cl += 1
+        answers[q] = inv
+    return answers
+
+def _check_queries(n, queries):
+    for l, r in queries:
+        if not (0 <= l <= r < n):
+            raise ValueError(f"Query [{l}, {r}] is outside array of length {n}")
+
+def range_inversions(arr, queries):
+    # queries: list of (l, r) pairs, 0-based and inclusive like the tree nodes
+    queries = [tuple(q) for q in queries]
+    _check_queries(len(arr), queries)
+    ranks, m = _compress_ranks(arr)
+    order = _mo_order(queries, len(arr))
+    return _mo_sweep(ranks, m, queries, order, [0] * len(queries))
+
+def range_inversions_numpy(arr, queries):
+    # same answers as range_inversions; NumPy does the rank compression and
+    # Mo ordering, and short slices skip the sweep via a vectorised pair count
+    a = np.asarray(arr)
+    q = np.asarray(queries, dtype=np.int64).reshape(-1, 2)
+    queries = [tuple(p) for p in q.tolist()]
+    _check_queries(len(a), queries)
+    answers = [0] * len(queries)
+    if not queries:
+        return answers
+
+    uniq, inverse = np.unique(a, return_inverse=True)
+    ranks = (inverse.ravel() + 1).tolist()
+
+    lengths = q[:, 1] - q[:, 0] + 1
+    for qi in np.flatnonzero(lengths <= SMALL_RANGE).tolist():
+        l, r = queries[qi]
+        s = a[l:r + 1]
+        answers[qi] = int(np.count_nonzero(np.triu(s[:, None] > s[None, :], 1)))
+
+    big = np.flatnonzero(lengths > SMALL_RANGE)
+    if big.size:
+        block = max(1, int(len(a) ** 0.5))
+        blk = q[big, 0] // block
+        r_key = np.where(blk % 2 == 0, q[big, 1], -q[big, 1])
+        order = big[np.lexsort((r_key, blk))].tolist()
+        _mo_sweep(ranks, len(uniq), queries, order, answers)
+    return answers
+
+def validate_range_inversions(arr, queries, use_numpy=False):
+    # cross-check against the merge-sort recorder on each slice (small inputs only)
+    solver = range_inversions_numpy if use_numpy else range_inversions
+    got = solver(arr, queries)
+    for (l, r), g in zip(queries, got):
+        expected = MergeRecorderClassroom(arr[l:r + 1]).total_inv
+        if g != expected:
+            raise AssertionError(f"Range [{l}, {r}]: got {g}, merge sort says {expected}")
+    return got
+
+# ----------------------------------------------------------
+# Trace-free merge-sort counting for big arrays (+ multiprocess mode)
+# ----------------------------------------------------------
+# below this size a partition is merge-sorted with plain Python lists
+MERGE_LEAF = 2048
+
+def _merge_count(L, R):
+    # same merge as MergeRecorderClassroom._merge_with_seq, without the trace
+    i = j = 0
+    merged = []
+    inv = 0
+    while i < len(L) and j < len(R):
+        if L[i] <= R[j]:
+            merged.append(L[i]); i += 1
+        else:
+            merged.append(R[j]); inv += len(L) - i; j += 1
+    merged.extend(L[i:]); merged.extend(R[j:])
+    return merged, inv
+
+def _merge_sort_count(a):
+    if len(a) <= 1:
+        return list(a), 0
+    mid = len(a) // 2
+    L, li = _merge_sort_count(a[:mid])
+    R, ri = _merge_sort_count(a[mid:])
+    merged, si = _merge_count(L, R)
+    return merged, li + ri + si
+
+def _merge_sorted_count(L, R):
+    # L, R sorted arrays: every right value is an inversion with each left value above it
+    split = len(L) * len(R) - int(np.searchsorted(L, R, side='right').sum())
+    return np.sort(np.concatenate((L, R)), kind='stable'), split
+
+def _sort_count(a):
+    # a: 1-D ndarray -> (sorted ndarray, inversion count)
+    if len(a) <= MERGE_LEAF:
+        merged, inv = _merge_sort_count(a.tolist())
+        return np.array(merged, dtype=a.dtype), inv
+    mid = len(a) // 2
+    L, li = _sort_count(a[:mid])
+    R, ri = _sort_count(a[mid:])
+    merged, si = _merge_sorted_count(L, R)
+    return merged, li + ri + si
+
+def count_inversions(arr):
+    return _sort_count(np.asarray(arr))[1]
+
+def count_inversions_parallel(arr, workers=None):
+    # workers sort + count the top-level partitions, the parent merges them
+    # back pairwise (a reduction tree) counting the cross-partition inversions
+    from concurrent.futures import ProcessPoolExecutor
+    import os
+
+    a = np.asarray(arr)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(a) <= MERGE_LEAF:
+        return count_inversions(a)
+
+    parts = [p for p in np.array_split(a, workers) if len(p)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_sort_count, parts))
+
+    total = sum(inv for _, inv in results)
+    level = [srt for srt, _ in results]
+    while len(level) > 1:
+        nxt = []
+        for k in range(0, len(level) - 1, 2):
+            merged, split = _merge_sorted_count(level[k], level[k + 1])
+            total += split
+            nxt.append(merged)
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return total
+
+def compare_inversion_modes(arr, workers=None):
+    # run both paths on the same data and report the speedup
+    import os
+
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    serial = count_inversions(arr)
+    t1 = time.perf_counter()
+    parallel = count_inversions_parallel(arr, workers)
+    t2 = time.perf_counter()
+    if serial != parallel:
+        raise AssertionError(f"Parallel count {parallel} != single-process count {serial}")
+    return {
+        'inversions': serial,
+        'workers': workers,
+        'serial_s': t1 - t0,
+        'parallel_s': t2 - t1,
+        'speedup': (t1 - t0) / (t2 - t1) if t2 > t1 else float('inf'),
+    }
+
 # ----------------------------------------------------------
 # Tree node helper and layout (balanced inorder placement)
 # ----------------------------------------------------------
@@ -1,48 +1,463 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.widgets import Button
+import numpy as np
+import csv
 
 
-prices = [7, 1, 5, 3, 6, 4]
+# ---------- PREPARE STEP DATA ----------
+def stock_steps(prices):
+    steps = []
+    min_price = float('inf')
+    min_index = -1
+    max_profit = 0
+    sell_index = -1
 
-steps = []
-min_price = float('inf')
-min_index = -1
-max_profit = 0
-sell_index = -1
+    for i in range(len(prices)):
+        price = prices[i]
 
+        # Update min (buy)
+        if price < min_price:
+            min_price = price
+            min_index = i
 
-# ---------- PREPARE STEP DATA ----------
-for i in range(len(prices)):
-    price = prices[i]
+        # Calculate potential profit
+        profit = price - min_price
+        if profit > max_profit:
+            max_profit = profit
+            sell_index = i
 
-    # Update min (buy)
-    if price < min_price:
-        min_price = price
-        min_index = i
+        steps.append({
+            "i": i,
+            "prices": prices,
+            "min_index": min_index,
+            "sell_index": sell_index
+        })
 
-    # Calculate potential profit
-    profit = price - min_price
-    if profit > max_profit:
-        max_profit = profit
-        sell_index = i
+    return steps
 
-    steps.append({
-        "i": i,
-        "prices": prices,
-        "min_index": min_index,
-        "sell_index": sell_index
-    })
 
+# ---------- STREAMING (TICK FEED) ----------
+class TickFeedEngine:
+    # Same scan as stock_steps, one price at a time, O(1) state.
+    # push() returns a step only when the BUY or SELL marker moves.
+    def __init__(self):
+        self.i = -1
+        self.min_price = float('inf')
+        self.min_index = -1
+        self.buy_index = -1      # min index at the time of the best sell
+        self.sell_index = -1
+        self.max_profit = 0
+
+    def push(self, price):
+        self.i += 1
+        old_markers = (self.min_index, self.sell_index)
+
+        if price < self.min_price:
+            self.min_price = price
+            self.min_index = self.i
+
+        profit = price - self.min_price
+        if profit > self.max_profit:
+            self.max_profit = profit
+            self.buy_index = self.min_index
+            self.sell_index = self.i
+
+        if (self.min_index, self.sell_index) == old_markers:
+            return None
+        return {
+            "i": self.i,
+            "price": price,
+            "min_index": self.min_index,
+            "min_price": self.min_price,
+            "buy_index": self.buy_index,
+            "sell_index": self.sell_index,
+            "max_profit": self.max_profit
+        }
+
+
+def stream_steps(ticks):
+    # ticks: any iterable / generator of prices
+    engine = TickFeedEngine()
+    for price in ticks:
+        step = engine.push(price)
+        if step is not None:
+            yield step
+
+
+def read_price_csv(path, column=0):
+    # column: index, or header name looked up on the first row
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        for row_no, row in enumerate(reader):
+            if not row:
+                continue
+            if isinstance(column, str):
+                column = row.index(column)
+                continue
+            try:
+                yield float(row[column])
+            except ValueError:
+                if row_no == 0:
+                    continue  # header row
+                raise
+
+
+def replay_csv(path, column=0):
+    return list(stream_steps(read_price_csv(path, column)))
+
+
+# ---------- VECTORIZED BATCH (NUMPY) ----------
+# values (tickers x columns) per block, so a 10^8 memmap never needs a
+# full-size temporary whatever the number of tickers
+BATCH_CHUNK = 1 << 22
+
+
+def _best_trade_rows(P, chunk):
+    # P: (tickers x time). Running min via np.minimum.accumulate, carried across
+    # time blocks; sell = first argmax of price - running min (as in stock_steps).
+    T, n = P.shape
+    chunk = max(1, chunk // max(T, 1))
+    rows = np.arange(T)
+    carry_min = np.full(T, np.inf)
+    best = np.zeros(T)
+    sell = np.full(T, -1, dtype=np.int64)
+    sell_min = np.zeros(T)
+
+    for start in range(0, n, chunk):
+        block = np.asarray(P[:, start:start + chunk], dtype=np.float64)
+        run_min = np.minimum.accumulate(block, axis=1)
+        np.minimum(run_min, carry_min[:, None], out=run_min)
+        profit = block - run_min
+        j = profit.argmax(axis=1)
+        p = profit[rows, j]
+        better = p > best
+        best[better] = p[better]
+        sell[better] = start + j[better]
+        sell_min[better] = run_min[rows, j][better]
+        carry_min = run_min[:, -1].copy()
+
+    # buy = first index holding the min that was live at the sell index
+    buy = np.full(T, -1, dtype=np.int64)
+    pending = sell >= 0
+    for start in range(0, n, chunk):
+        if not pending.any():
+            break
+        block = np.asarray(P[:, start:start + chunk], dtype=np.float64)
+        hit = (block == sell_min[:, None]) & pending[:, None]
+        found = hit.any(axis=1)
+        buy[found] = start + hit.argmax(axis=1)[found]
+        pending &= ~found
+
+    return buy, sell, best
+
+
+def best_trade_numpy(prices, chunk=BATCH_CHUNK):
+    # one series (list, ndarray or np.memmap) -> (buy_index, sell_index, max_profit)
+    P = np.asarray(prices)
+    if P.size == 0:
+        return -1, -1, 0.0
+    buy, sell, best = _best_trade_rows(P.reshape(1, -1), chunk)
+    return int(buy[0]), int(sell[0]), float(best[0])
+
+
+def best_trade_matrix(price_matrix, chunk=BATCH_CHUNK):
+    # (tickers x time) matrix, all tickers in one pass -> three arrays of length tickers
+    P = np.asarray(price_matrix)
+    if P.ndim != 2:
+        raise ValueError("price_matrix must be 2-D (tickers x time)")
+    if P.shape[1] == 0:
+        T = P.shape[0]
+        return np.full(T, -1, dtype=np.int64), np.full(T, -1, dtype=np.int64), np.zeros(T)
+    return _best_trade_rows(P, chunk)
+
+
+def open_price_memmap(path, dtype=np.float64, shape=None):
+    # raw binary price file (e.g. written with ndarray.tofile) opened read-only
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+# ---------- MORE TRANSACTIONS: AT MOST K / COOLDOWN / FEE ----------
+# Every engine returns (max_profit, trades) where trades is a list of
+# (buy_index, sell_index) pairs; trace=False skips the decision log and
+# returns an empty list.
+def max_profit_cooldown_fee(prices, cooldown=0, fee=0, trace=True):
+    # Unlimited transactions. After selling on day t the next buy is on day
+    # t + 1 + cooldown at the earliest; every sell pays `fee`.
+    # Rolling state: hold, free, and the last cooldown + 1 free values.
+    n = len(prices)
+    hold = float('-inf')
+    free = 0
+    recent_free = [0] * (cooldown + 1)   # ring: free values that are old enough to buy on
+    bought = bytearray(n) if trace else None
+    sold = bytearray(n) if trace else None
+
+    for t in range(n):
+        p = prices[t]
+        usable = recent_free[t % (cooldown + 1)]   # free value after day t - 1 - cooldown
+        new_hold = hold
+        if usable - p > hold:
+            new_hold = usable - p
+            if trace: bought[t] = 1
+        new_free = free
+        if hold + p - fee > free:
+            new_free = hold + p - fee
+            if trace: sold[t] = 1
+        hold, free = new_hold, new_free
+        recent_free[t % (cooldown + 1)] = free
+
+    trades = []
+    if trace:
+        t = n - 1
+        selling = True
+        sell_t = -1
+        while t >= 0:
+            if selling:
+                if sold[t]:
+                    sell_t = t
+                    selling = False
+                t -= 1
+            else:
+                if bought[t]:
+                    trades.append((t, sell_t))
+                    selling = True
+                    t -= 1 + cooldown
+                else:
+                    t -= 1
+        trades.reverse()
+    return free, trades
+
+
+def max_profit_cooldown(prices, cooldown=1, trace=True):
+    return max_profit_cooldown_fee(prices, cooldown=cooldown, trace=trace)
+
+
+def max_profit_fee(prices, fee, trace=True):
+    return max_profit_cooldown_fee(prices, fee=fee, trace=trace)
 
-# ---------- VISUALIZATION ----------
-fig, ax = plt.subplots(figsize=(12, 6))
-plt.subplots_adjust(bottom=0.25)
 
-current_step = 0
+def max_profit_k_transactions(prices, k, trace=True):
+    # At most k buy/sell pairs. NumPy DP vectorised over j = 1..k:
+    #   buy[j]  = max(buy[j],  sell[j-1] - p)
+    #   sell[j] = max(sell[j], buy[j] + p)
+    # With trace, each step keeps two bit-packed k-wide decision rows.
+    n = len(prices)
+    if k <= 0 or n < 2:
+        return 0, []
+    if k >= n // 2:
+        # k can't be the limit, same answer as unlimited transactions
+        return max_profit_cooldown_fee(prices, trace=trace)
 
+    P = np.asarray(prices, dtype=np.float64)
+    buy = np.full(k, -np.inf)
+    sell = np.zeros(k)
+    prev_sell = np.zeros(k)            # sell[j-1] from the previous day, sell[-1] = 0
+    took_buy = np.zeros((n, (k + 7) // 8), dtype=np.uint8) if trace else None
+    took_sell = np.zeros((n, (k + 7) // 8), dtype=np.uint8) if trace else None
 
+    for t in range(n):
+        p = P[t]
+        prev_sell[1:] = sell[:-1]
+        cand_buy = prev_sell - p
+        cand_sell = buy + p
+        if trace:
+            b = cand_buy > buy
+            s = cand_sell > sell
+            took_buy[t] = np.packbits(b)
+            took_sell[t] = np.packbits(s)
+        np.maximum(buy, cand_buy, out=buy)
+        np.maximum(sell, cand_sell, out=sell)
+
+    best = sell[-1]
+    trades = []
+    if trace and best > 0:
+        j = int(np.argmax(sell == best))   # fewest transactions reaching the best profit
+        t = n - 1
+        selling = True
+        sell_t = -1
+        while t >= 0 and j >= 0:
+            row = took_sell if selling else took_buy
+            hit = (row[t, j >> 3] >> (7 - (j & 7))) & 1
+            if selling:
+                if hit:
+                    sell_t = t
+                    selling = False
+            elif hit:
+                trades.append((t, sell_t))
+                selling = True
+                j -= 1
+            t -= 1
+        trades.reverse()
+    return float(best), trades
+
+
+def trade_steps(prices, trades):
+    # one step per chosen pair so draw() can reveal the trades one by one
+    steps = []
+    for m, (b, s) in enumerate(trades):
+        steps.append({
+            "i": s,
+            "prices": prices,
+            "min_index": b,
+            "sell_index": s,
+            "trades": trades[:m + 1]
+        })
+    return steps
+
+
+# ---------- SLIDING WINDOW (LAST W TICKS) ----------
+# Window summary: (min, min_i, max, max_i, profit, buy_i, sell_i).
+# Summaries of two adjacent stretches combine in O(1), which is what lets
+# the window slide without rescanning it.
+def _window_summary(i, price):
+    return (price, i, price, i, 0, i, -1)
+
+
+def _combine(a, b):
+    # a comes before b in time
+    if a is None:
+        return b
+    if b is None:
+        return a
+    lo, lo_i = (a[0], a[1]) if a[0] <= b[0] else (b[0], b[1])
+    hi, hi_i = (a[2], a[3]) if a[2] >= b[2] else (b[2], b[3])
+    best = a[4:]
+    if b[2] - a[0] > best[0]:
+        best = (b[2] - a[0], a[1], b[3])     # buy in a, sell in b
+    if b[4] > best[0]:
+        best = b[4:]
+    return (lo, lo_i, hi, hi_i) + best
+
+
+class SlidingWindowTrader:
+    # Best buy/sell pair inside the last `window` ticks, amortised O(1) per tick.
+    # Candidate buys live in a two-stack queue: new ticks go on the back stack,
+    # expired ones come off the front stack, which holds the summary of itself
+    # and everything behind it, so the window answer is front[-1] + back.
+    def __init__(self, window):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.i = -1
+        self.front = []          # (index, summary from this tick to the end of front)
+        self.back = []           # (index, price)
+        self.back_summary = None
+
+    def _pop_front(self):
+        if not self.front:
+            agg = None
+            while self.back:
+                i, price = self.back.pop()
+                agg = _combine(_window_summary(i, price), agg)
+                self.front.append((i, agg))
+            self.back_summary = None
+        self.front.pop()
+
+    def push(self, price):
+        self.i += 1
+        self.back.append((self.i, price))
+        self.back_summary = _combine(self.back_summary, _window_summary(self.i, price))
+        if len(self.front) + len(self.back) > self.window:
+            self._pop_front()
+
+        s = _combine(self.front[-1][1] if self.front else None, self.back_summary)
+        profit, buy_i, sell_i = s[4:]
+        if sell_i == -1:
+            buy_i = s[1]         # no profitable pair: BUY marker sits on the window min
+        return {
+            "i": self.i,
+            "window": (self.i - len(self.front) - len(self.back) + 1, self.i),
+            "min_index": buy_i,
+            "sell_index": sell_i,
+            "max_profit": profit
+        }
+
+
+def sliding_window_steps(prices, window):
+    trader = SlidingWindowTrader(window)
+    steps = []
+    for price in prices:
+        step = trader.push(price)
+        step["prices"] = prices
+        steps.append(step)
+    return steps
+
+
+# ---------- LONG SERIES CHART MODE ----------
+# above this many prices draw() switches from boxes to the decimated chart
+CHART_THRESHOLD = 200
+chart = None
+
+
+def decimate_minmax(prices, buckets):
+    # min and max of each bucket (one bucket per pixel column), so spikes survive
+    P = np.asarray(prices)
+    n = len(P)
+    if n <= 2 * buckets:
+        return np.arange(n), P
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    mins = np.minimum.reduceat(P, starts)
+    maxs = np.maximum.reduceat(P, starts)
+    mid = (starts + edges[1:] - 1) / 2
+    x = np.repeat(mid, 2)
+    y = np.empty(2 * buckets, dtype=np.result_type(mins, np.float64))
+    y[0::2] = mins
+    y[1::2] = maxs
+    return x, y
+
+
+class PriceChart:
+    # The series is decimated once and drawn as a single line artist; a step
+    # only moves the BUY/SELL markers, the cursor and the info text, so the
+    # redraw cost does not depend on the series length.
+    def __init__(self, ax, prices, buckets=None):
+        self.ax = ax
+        self.prices = np.asarray(prices)
+        buckets = buckets or max(1, int(ax.bbox.width))
+        x, y = decimate_minmax(self.prices, buckets)
+
+        ax.set_title("Best Time to Buy & Sell Stock – Price Chart", fontsize=16, weight='bold')
+        self.line, = ax.plot(x, y, color="#20232a", lw=1)
+        self.buy_marker, = ax.plot([], [], "^", color="green", ms=11, label="BUY")
+        self.sell_marker, = ax.plot([], [], "v", color="orange", ms=11, label="SELL")
+        self.cursor = ax.axvline(0, color="#888888", lw=1, ls="--")
+        self.window = patches.Rectangle((0, 0), 0, 1, transform=ax.get_xaxis_transform(),
+                                        color="#2D82F0", alpha=0.12, visible=False)
+        ax.add_patch(self.window)
+        self.info = ax.text(0.01, 0.97, "", transform=ax.transAxes, va="top", fontsize=11)
+        ax.set_xlim(0, max(1, len(self.prices) - 1))
+        ax.legend(loc="upper right")
+
+    def show(self, step, step_id, total):
+        if "trades" in step:
+            buys = [b for b, _ in step["trades"]]
+            sells = [s for _, s in step["trades"]]
+        else:
+            buys = [step["min_index"]] if step["min_index"] != -1 else []
+            sells = [step["sell_index"]] if step["sell_index"] != -1 else []
+        self.buy_marker.set_data(buys, self.prices[buys])
+        self.sell_marker.set_data(sells, self.prices[sells])
+        self.cursor.set_xdata([step["i"], step["i"]])
+        if "window" in step:
+            w_start, w_end = step["window"]
+            self.window.set_x(w_start)
+            self.window.set_width(w_end - w_start + 1)
+            self.window.set_visible(True)
+
+        text = f"Step: {step_id + 1}/{total}   |   Index {step['i']}   Price = {self.prices[step['i']]}"
+        if sells:
+            text += f"\nBuy {buys[-1]} -> Sell {sells[-1]}"
+        self.info.set_text(text)
+
+
+# ---------- VISUALIZATION ----------
 def draw(step_id):
+    if chart is not None:
+        chart.show(steps[step_id], step_id, len(steps))
+        fig.canvas.draw_idle()
+        return
+
     ax.clear()
     step = steps[step_id]
 
@@ -58,31 +473,44 @@ def draw(step_id):
         ax.add_patch(box)
         ax.text(i + 0.5, 0.5, str(v), ha="center", va="center", color="white", fontsize=12, weight='bold')
 
-    # Arrow for min (BUY)
-    ax.annotate(
-        "BUY (min)",
-        xy=(min_idx + 0.5, 1.05),
-        xytext=(min_idx + 0.5, 1.6),
-        arrowprops=dict(arrowstyle="->", lw=2),
-        ha="center",
-        fontsize=12,
-        color="green",
-        weight='bold'
-    )
-
-    # Arrow for max SELL
-    if sell_idx != -1 and sell_idx != min_idx:
+    # Sliding window outline
+    if "window" in step:
+        w_start, w_end = step["window"]
+        ax.add_patch(patches.Rectangle((w_start, -0.08), w_end - w_start + 1, 1.16, fill=False,
+                                       edgecolor="#2D82F0", linewidth=3))
+
+    # BUY / SELL arrows: the single min/max pair, or every chosen trade
+    if "trades" in step:
+        pairs = [(b, s, f"BUY {n}", f"SELL {n}") for n, (b, s) in enumerate(step["trades"], 1)]
+    else:
+        pairs = [(min_idx, sell_idx, "BUY (min)", "SELL (max)")]
+
+    for buy_i, sell_i, buy_label, sell_label in pairs:
+        # Arrow for min (BUY)
         ax.annotate(
-            "SELL (max)",
-            xy=(sell_idx + 0.5, 1.05),
-            xytext=(sell_idx + 0.5, 1.6),
+            buy_label,
+            xy=(buy_i + 0.5, 1.05),
+            xytext=(buy_i + 0.5, 1.6),
             arrowprops=dict(arrowstyle="->", lw=2),
             ha="center",
             fontsize=12,
-            color="orange",
+            color="green",
             weight='bold'
         )
 
+        # Arrow for max SELL
+        if sell_i != -1 and sell_i != buy_i:
+            ax.annotate(
+                sell_label,
+                xy=(sell_i + 0.5, 1.05),
+                xytext=(sell_i + 0.5, 1.6),
+                arrowprops=dict(arrowstyle="->", lw=2),
+                ha="center",
+                fontsize=12,
+                color="orange",
+                weight='bold'
+            )
+
     # Step info
     ax.text(0, -0.4, f"Step: {step_id + 1}/{len(steps)}", fontsize=12, weight='bold')
     ax.text(0, -0.7, f"Current Index: {step['i']}   |   Price = {prices[step['i']]}", fontsize=11)
@@ -111,15 +539,27 @@ def prev_step(event):
     draw(current_step)
 
 
-# Buttons
-axprev = plt.axes([0.25, 0.05, 0.15, 0.08])
-axnext = plt.axes([0.60, 0.05, 0.15, 0.08])
+if __name__ == "__main__":
+    prices = [7, 1, 5, 3, 6, 4]
+    steps = stock_steps(prices)
+    current_step = 0
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    plt.subplots_adjust(bottom=0.25)
+
+    # long histories: single decimated line + markers instead of one box per price
+    if len(prices) > CHART_THRESHOLD:
+        chart = PriceChart(ax, prices)
+
+    # Buttons
+    axprev = plt.axes([0.25, 0.05, 0.15, 0.08])
+    axnext = plt.axes([0.60, 0.05, 0.15, 0.08])
 
-bnext = Button(axnext, "NEXT →")
-bprev = Button(axprev, "← PREV")
+    bnext = Button(axnext, "NEXT →")
+    bprev = Button(axprev, "← PREV")
 
-bnext.on_clicked(next_step)
-bprev.on_clicked(prev_step)
+    bnext.on_clicked(next_step)
+    bprev.on_clicked(prev_step)
 
-draw(0)
-plt.show()
+    draw(0)
+    plt.show()
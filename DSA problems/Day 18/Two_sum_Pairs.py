@@ -1,12 +1,17 @@
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button
 import matplotlib.patches as patches
+from bisect import bisect_left, bisect_right
+from functools import cmp_to_key
+import numpy as np
+import time
 
 # =====================================
 # LOGIC + VISUAL MESSAGE CAPTURE
 # =====================================
 
 def two_sum_zero_steps(arr):
+    # nums never changes after sorting, so every step shares the same list
     steps = []
     nums = sorted(arr)
     n = len(nums)
@@ -14,14 +19,14 @@ def two_sum_zero_steps(arr):
     l, r = 0, n - 1
     result = []
 
-    steps.append(("Initial Sorted Array", nums[:], l, r, None, result[:], "normal"))
+    steps.append(("Initial Sorted Array", nums, l, r, None, result[:], "normal"))
 
     while l < r:
         current_sum = nums[l] + nums[r]
 
         steps.append((
             f"Checking nums[{l}] + nums[{r}] = {nums[l]} + {nums[r]} = {current_sum}",
-            nums[:],
+            nums,
             l,
             r,
             current_sum,
@@ -37,7 +42,7 @@ def two_sum_zero_steps(arr):
                 result.append(pair)
                 steps.append((
                     f"Found Unique Pair → {pair}",
-                    nums[:],
+                    nums,
                     l,
                     r,
                     current_sum,
@@ -57,53 +62,243 @@ def two_sum_zero_steps(arr):
             r -= 1
 
         # GLOBAL DUPLICATE SKIPS (Both Sides)
-        while l < r and (l - 1) >= 0 and nums[l] == nums[l - 1]:
+        # each run is jumped with bisect and recorded as ONE compressed step
+        if l < r and (l - 1) >= 0 and nums[l] == nums[l - 1]:
+            stop = bisect_right(nums, nums[l - 1], l, r)
             steps.append((
-                f"Duplicate at LEFT → nums[{l}] = {nums[l]} (Skipping)",
-                nums[:],
-                l,
+                f"Duplicate run at LEFT → skipped {stop - l} × {nums[l]} (nums[{l}..{stop - 1}])",
+                nums,
+                stop,
                 r,
                 current_sum,
                 result[:],
-                "duplicate"
+                "duplicate",
+                {"side": "left", "start": l, "stop": stop, "other": r}
             ))
-            l += 1
+            l = stop
 
-        while l < r and (r + 1) < n and nums[r] == nums[r + 1]:
+        if l < r and (r + 1) < n and nums[r] == nums[r + 1]:
+            stop = bisect_left(nums, nums[r + 1], l + 1, r + 1) - 1
             steps.append((
-                f"Duplicate at RIGHT → nums[{r}] = {nums[r]} (Skipping)",
-                nums[:],
+                f"Duplicate run at RIGHT → skipped {r - stop} × {nums[r]} (nums[{stop + 1}..{r}])",
+                nums,
                 l,
-                r,
+                stop,
                 current_sum,
                 result[:],
-                "duplicate"
+                "duplicate",
+                {"side": "right", "start": r, "stop": stop, "other": l}
             ))
-            r -= 1
+            r = stop
 
-    steps.append(("Final Result", nums[:], -1, -1, None, result[:], "final"))
+    steps.append(("Final Result", nums, -1, -1, None, result[:], "final"))
     return steps
 
 
-# SAMPLE ARRAY
-arr = [2, 8, -2, 1, -1, 5, -5, 3, -3, 0, 0, -5, 2, -2, 4, -4]
-steps = two_sum_zero_steps(arr)
-index = 0
+def expand_duplicate_run(step):
+    # compressed duplicate step -> the one-frame-per-index steps it stands for
+    title, nums, l, r, current_sum, result, status, run = step
+    frames = []
+    if run["side"] == "left":
+        for i in range(run["start"], run["stop"]):
+            frames.append((f"Duplicate at LEFT → nums[{i}] = {nums[i]} (Skipping)",
+                           nums, i, run["other"], current_sum, result, "duplicate"))
+    else:
+        for i in range(run["start"], run["stop"], -1):
+            frames.append((f"Duplicate at RIGHT → nums[{i}] = {nums[i]} (Skipping)",
+                           nums, run["other"], i, current_sum, result, "duplicate"))
+    return frames
+
 
 # =====================================
-# VISUALIZATION
+# TRACE-FREE ENGINES + COUNTERS
 # =====================================
+# Both engines return (pairs, stats). Pairs are unique [small, big] value
+# pairs adding up to `target`; pass stats={} to have the counters filled in.
+
+def two_sum_two_pointer(arr, target=0, stats=None):
+    # same walk as two_sum_zero_steps: sort (O(n log n)), then two pointers
+    if stats is not None:
+        stats.update(sort_comparisons=0, comparisons=0)
+
+        def counted(a, b):
+            stats["sort_comparisons"] += 1
+            return int(a > b) - int(a < b)
+
+        nums = sorted(arr, key=cmp_to_key(counted))
+    else:
+        nums = sorted(arr)
+
+    l, r = 0, len(nums) - 1
+    result = []
+    while l < r:
+        current_sum = nums[l] + nums[r]
+        if stats is not None:
+            stats["comparisons"] += 1
+
+        if current_sum == target:
+            if not result or result[-1] != [nums[l], nums[r]]:
+                result.append([nums[l], nums[r]])
+            l += 1
+            r -= 1
+        elif current_sum < target:
+            l += 1
+        else:
+            r -= 1
+
+        while l < r and l > 0 and nums[l] == nums[l - 1]:
+            if stats is not None:
+                stats["comparisons"] += 1
+            l += 1
+        while l < r and r + 1 < len(nums) and nums[r] == nums[r + 1]:
+            if stats is not None:
+                stats["comparisons"] += 1
+            r -= 1
+
+    return result, stats
 
-fig, ax = plt.subplots(figsize=(14, 7))
-plt.subplots_adjust(bottom=0.25)
-fig.patch.set_facecolor("#111")
 
+def two_sum_hash(arr, target=0, stats=None):
+    # one O(n) pass over the unsorted input: look up the complement of each
+    # value among the values already seen; `found` keeps the pairs unique
+    if stats is not None:
+        stats.update(probes=0, inserts=0)
+
+    seen = set()
+    found = set()
+    result = []
+    for x in arr:
+        need = target - x
+        if stats is not None:
+            stats["probes"] += 1
+        if need in seen:
+            pair = (need, x) if need <= x else (x, need)
+            if pair not in found:
+                found.add(pair)
+                result.append(list(pair))
+        if x not in seen:
+            seen.add(x)
+            if stats is not None:
+                stats["inserts"] += 1
+
+    return result, stats
+
+
+def compare_two_sum_engines(arr, target=0, repeat=3):
+    # counters come from one counted run, times from the best of `repeat` plain runs
+    report = {}
+    for name, engine in (("two_pointer", two_sum_two_pointer), ("hash", two_sum_hash)):
+        pairs, stats = engine(arr, target, stats={})
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            engine(arr, target)
+            best = min(best, time.perf_counter() - t0)
+        report[name] = dict(stats, pairs=len(pairs), seconds=best)
+
+    a = sorted(two_sum_two_pointer(arr, target)[0])
+    b = sorted(two_sum_hash(arr, target)[0])
+    if a != b:
+        raise AssertionError("Engines disagree on the pair set")
+    return report
+
+
+# =====================================
+# K-SUM (3-SUM, 4-SUM, ...) WITH NUMPY INNER PHASE
+# =====================================
+# Outer indices are fixed in Python with min/max pruning and duplicate
+# jumps; the innermost two-sum runs vectorised (np.searchsorted over the
+# distinct values of the remaining suffix). Pass steps=[] to record the
+# outer loop only, as tuples draw_step() understands; each of those keeps
+# just the last TRACE_TAIL tuples found, since 3-sum output can be huge.
+TRACE_TAIL = 6
+
+
+def _pairs_vectorized(seg, target):
+    # seg: sorted ndarray -> unique (a, b) with a <= b, a + b == target
+    if len(seg) < 2:
+        return []
+    first = np.empty(len(seg), dtype=bool)
+    first[0] = True
+    np.not_equal(seg[1:], seg[:-1], out=first[1:])
+    starts = np.flatnonzero(first)
+    vals = seg[starts]
+    counts = np.diff(np.append(starts, len(seg)))
+
+    comp = target - vals
+    pos = np.searchsorted(vals, comp)
+    hit = pos < len(vals)
+    hit[hit] = vals[pos[hit]] == comp[hit]
+    hit &= vals <= comp
+    hit &= (vals != comp) | (counts >= 2)
+    return list(zip(vals[hit].tolist(), comp[hit].tolist()))
+
+
+def _k_sum(nums, lo, k, target, prefix, result, steps, shown):
+    n = len(nums)
+    if k == 2:
+        for a, b in _pairs_vectorized(nums[lo:], target):
+            result.append(prefix + [a, b])
+        return
+
+    largest_rest = nums[n - (k - 1):].sum()     # best case for the k - 1 still to pick
+    i = lo
+    while i <= n - k:
+        v = nums[i]
+        if v + nums[i + 1:i + k].sum() > target:
+            # smallest possible sum is already too big, and it only grows with i
+            if steps is not None:
+                steps.append((f"Prune: nums[{i}] = {v} → smallest sum > {target}, stop depth {len(prefix) + 1}",
+                              shown, i, n - 1, None, result[-TRACE_TAIL:], "prune"))
+            break
+        nxt = int(np.searchsorted(nums, v, side="right"))   # next distinct value
+        if v + largest_rest < target:
+            if steps is not None:
+                steps.append((f"Prune: nums[{i}] = {v} → largest sum < {target}, skip",
+                              shown, i, n - 1, None, result[-TRACE_TAIL:], "prune"))
+            i = nxt
+            continue
+
+        if steps is not None:
+            steps.append((f"Fix nums[{i}] = {v} (depth {len(prefix) + 1}), need {target - v} from {k - 1}",
+                          shown, i, n - 1, None, result[-TRACE_TAIL:], "normal"))
+        _k_sum(nums, i + 1, k - 1, target - v, prefix + [v.item()], result, steps, shown)
+        if steps is not None and nxt - i > 1:
+            steps.append((f"Duplicate run of {v} → skip {nxt - i - 1} index(es)",
+                          shown, i, n - 1, None, result[-TRACE_TAIL:], "duplicate"))
+        i = nxt
+
+
+def k_sum(arr, k, target=0, steps=None):
+    if k < 2:
+        raise ValueError("k must be at least 2")
+    nums = np.sort(np.asarray(arr))
+    shown = nums.tolist() if steps is not None else None   # shared by every traced step
+    result = []
+    if steps is not None:
+        steps.append((f"Sorted array, looking for {k} numbers adding to {target}",
+                      shown, -1, -1, None, [], "normal"))
+    if len(nums) >= k:
+        _k_sum(nums, 0, k, target, [], result, steps, shown)
+    if steps is not None:
+        steps.append(("Final Result", shown, -1, -1, None, result[:], "final"))
+    return result
+
+
+def three_sum(arr, target=0, steps=None):
+    return k_sum(arr, 3, target, steps)
+
+
+# =====================================
+# VISUALIZATION
+# =====================================
 
 def draw_step():
     ax.clear()
     ax.set_facecolor("#111")
 
-    title, nums, l, r, current_sum, result, status = steps[index]
+    title, nums, l, r, current_sum, result, status = steps[index][:7]
+    run = steps[index][7] if len(steps[index]) > 7 else None
 
     # Title
     ax.set_title(title, fontsize=20, color="white", fontweight="bold", pad=20)
@@ -163,6 +358,14 @@ def draw_step():
     if status == "duplicate":
         ax.text(0, -0.2, "Duplicate Detected → Skipping Pointer",
                 fontsize=20, color="red", fontweight="bold")
+        if run is not None:
+            ax.text(len(nums), -0.2, "press E to expand run",
+                    ha='right', fontsize=12, color="#BBBBBB")
+
+    # Bound Prune Highlight (k-sum outer loop)
+    if status == "prune":
+        ax.text(0, -0.2, "Bounds Check → Pruned",
+                fontsize=20, color="orange", fontweight="bold")
 
     # Pair Found Highlight
     if status == "pair":
@@ -189,15 +392,38 @@ def prev_step(event):
     draw_step()
 
 
-# BUTTONS
-axprev = plt.axes([0.25, 0.05, 0.15, 0.1])
-axnext = plt.axes([0.60, 0.05, 0.15, 0.1])
+def on_key(event):
+    # E on a compressed duplicate run splices in its per-index frames
+    if event.key in ("e", "E") and len(steps[index]) > 7:
+        steps[index:index + 1] = expand_duplicate_run(steps[index])
+        draw_step()
+    elif event.key == "right":
+        next_step(event)
+    elif event.key == "left":
+        prev_step(event)
+
 
-btn_prev = Button(axprev, 'Previous', color="#444", hovercolor="#666")
-btn_next = Button(axnext, 'Next', color="#444", hovercolor="#666")
+if __name__ == "__main__":
+    # SAMPLE ARRAY
+    arr = [2, 8, -2, 1, -1, 5, -5, 3, -3, 0, 0, -5, 2, -2, 4, -4]
+    steps = two_sum_zero_steps(arr)
+    index = 0
 
-btn_prev.on_clicked(prev_step)
-btn_next.on_clicked(next_step)
+    fig, ax = plt.subplots(figsize=(14, 7))
+    plt.subplots_adjust(bottom=0.25)
+    fig.patch.set_facecolor("#111")
 
-draw_step()
-plt.show()
+    # BUTTONS
+    axprev = plt.axes([0.25, 0.05, 0.15, 0.1])
+    axnext = plt.axes([0.60, 0.05, 0.15, 0.1])
+
+    btn_prev = Button(axprev, 'Previous', color="#444", hovercolor="#666")
+    btn_next = Button(axnext, 'Next', color="#444", hovercolor="#666")
+
+    btn_prev.on_clicked(prev_step)
+    btn_next.on_clicked(next_step)
+
+    fig.canvas.mpl_connect("key_press_event", on_key)
+
+    draw_step()
+    plt.show()
@@ -1,16 +1,22 @@
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button
 import matplotlib.patches as patches
+import numpy as np
+import heapq
+import os
+import time
 
 # =========================================================
 #         LOGIC TO CAPTURE EACH STEP (FULL ITERATION)
 # =========================================================
 
-def common_unique_steps(A, B, C):
+def common_unique_steps(A, B, C, stats=None):
     steps = []
     
     i = j = k = 0
     result = []
+    if stats is not None:
+        stats["comparisons"] = 0
 
     # Continue until ALL pointers reach end
     while i <= len(A) or j <= len(B) or k <= len(C):
@@ -43,9 +49,14 @@ def common_unique_steps(A, B, C):
             else: break
 
         else:
+            if stats is not None:
+                # value comparisons made by the branch chain below
+                stats["comparisons"] += (1 if Ai != Bj else 2) + (0 if Ai == Bj == Ck else 1 if Ai < Bj else 2)
+
             # Full common element logic
             if Ai == Bj == Ck:
-                if Ai not in result:
+                # inputs are sorted, so a repeat can only match the last one added
+                if not result or result[-1] != Ai:
                     result.append(Ai)
                     step_info["action"] = f"Common Found → {Ai} added"
                 else:
@@ -68,10 +79,251 @@ def common_unique_steps(A, B, C):
     return steps
 
 
+# =========================================================
+#      GALLOPING MODE (SKEWED SIZES: ONE TINY, OTHERS HUGE)
+# =========================================================
+# Every lagging pointer jumps straight to the first value >= the largest
+# head: exponential probes 1, 2, 4, ... then a binary search inside the
+# last gap. Each jump is ONE step with a "span" entry (row, from, to).
+
+def _gallop(arr, lo, target, stats):
+    # arr[lo] < target; returns first index > lo with arr[index] >= target
+    n = len(arr)
+    prev, bound = lo, 1
+    while lo + bound < n:
+        stats["comparisons"] += 1
+        if arr[lo + bound] >= target:
+            break
+        prev = lo + bound
+        bound *= 2
+    left, right = prev + 1, min(lo + bound, n)
+    while left < right:
+        mid = (left + right) // 2
+        stats["comparisons"] += 1
+        if arr[mid] < target:
+            left = mid + 1
+        else:
+            right = mid
+    return left
+
+
+def common_gallop_steps(A, B, C, stats=None):
+    stats = {} if stats is None else stats
+    stats["comparisons"] = 0
+    arrays = (A, B, C)
+    ptrs = [0, 0, 0]
+    result = []
+    steps = []
+
+    def record(action, span=None):
+        step = {
+            "i": ptrs[0], "j": ptrs[1], "k": ptrs[2],
+            "A": A, "B": B, "C": C,
+            "result": result[:],
+            "Ai": A[ptrs[0]] if ptrs[0] < len(A) else None,
+            "Bj": B[ptrs[1]] if ptrs[1] < len(B) else None,
+            "Ck": C[ptrs[2]] if ptrs[2] < len(C) else None,
+            "action": action
+        }
+        if span is not None:
+            step["span"] = span
+        steps.append(step)
+
+    while all(p < len(a) for p, a in zip(ptrs, arrays)):
+        heads = [a[p] for p, a in zip(ptrs, arrays)]
+        target = max(heads)
+        stats["comparisons"] += 2
+
+        if heads[0] == heads[1] == heads[2]:
+            stats["comparisons"] += 2
+            if not result or result[-1] != target:
+                result.append(target)
+                record(f"Common Found → {target} added")
+            else:
+                record(f"{target} already in result → skip")
+            ptrs = [p + 1 for p in ptrs]
+            continue
+
+        for r, name in enumerate("ijk"):
+            if heads[r] < target:
+                stats["comparisons"] += 1
+                old = ptrs[r]
+                ptrs[r] = _gallop(arrays[r], old, target, stats)
+                record(f"Gallop {name}: {old} → {ptrs[r]} (skipped {ptrs[r] - old} < {target})",
+                       span=(r, old, ptrs[r]))
+                if ptrs[r] == len(arrays[r]):
+                    break
+
+    record("One array exhausted → done")
+    return steps
+
+
+def compare_common_modes(A, B, C):
+    # value comparisons and trace length of the linear walk vs. galloping
+    linear, gallop = {}, {}
+    linear_steps = common_unique_steps(A, B, C, linear)
+    gallop_steps = common_gallop_steps(A, B, C, gallop)
+    linear["steps"] = len(linear_steps)
+    gallop["steps"] = len(gallop_steps)
+    return {"linear": linear, "gallop": gallop}
+
+
+# =========================================================
+#       TRACE-FREE MODE (EARLY EXIT + CHUNKED MEMMAP)
+# =========================================================
+
+def common_unique(A, B, C):
+    # same walk as common_unique_steps, no trace; stops as soon as any array ends
+    i = j = k = 0
+    result = []
+    while i < len(A) and j < len(B) and k < len(C):
+        Ai, Bj, Ck = A[i], B[j], C[k]
+        if Ai == Bj == Ck:
+            if not result or result[-1] != Ai:
+                result.append(Ai)
+            i += 1; j += 1; k += 1
+        elif Ai < Bj:
+            i += 1
+        elif Bj < Ck:
+            j += 1
+        else:
+            k += 1
+    return result
+
+
+def _dedupe_sorted(x, assume_unique):
+    # slices are sorted, so duplicates are neighbours: O(n) instead of np.unique's sort
+    x = np.asarray(x)
+    if assume_unique or x.size < 2:
+        return x
+    keep = np.empty(x.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(x[1:], x[:-1], out=keep[1:])
+    return x[keep]
+
+
+def _open_sorted(x, dtype):
+    # paths (str or os.PathLike) are memory-mapped; an empty file cannot be
+    # mapped, so it becomes an empty array
+    if isinstance(x, (str, os.PathLike)):
+        if os.path.getsize(x) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(x, dtype=dtype, mode="r")
+    return np.asarray(x)
+
+
+def intersect_sorted_files(inputs, out_path, dtype=np.int64, chunk=1 << 22, assume_unique=False):
+    # inputs: paths to raw sorted binary files (or arrays / np.memmap objects);
+    # assume_unique=True skips the duplicate pass for files without repeats.
+    # Works window by window: hi = smallest value found `chunk` places ahead in
+    # any input, so every slice <= hi stays about chunk long; all copies of hi
+    # land in the same window, so nothing is emitted twice. Results are
+    # appended to out_path as they are found. Stops when any input runs out.
+    arrays = [_open_sorted(x, dtype) for x in inputs]
+    cursors = [0] * len(arrays)
+    written = 0
+    t0 = time.perf_counter()
+
+    with open(out_path, "wb") as out:
+        while all(c < len(a) for c, a in zip(cursors, arrays)):
+            hi = min(a[min(c + chunk, len(a)) - 1] for c, a in zip(cursors, arrays))
+            ends = [c + int(np.searchsorted(a[c:], hi, side="right")) for c, a in zip(cursors, arrays)]
+
+            common = _dedupe_sorted(arrays[0][cursors[0]:ends[0]], assume_unique)
+            for a, c, e in zip(arrays[1:], cursors[1:], ends[1:]):
+                if common.size == 0:
+                    break
+                common = np.intersect1d(common, _dedupe_sorted(a[c:e], assume_unique), assume_unique=True)
+            common.astype(dtype, copy=False).tofile(out)
+            written += common.size
+            cursors = ends
+
+    seconds = time.perf_counter() - t0
+    read = sum(cursors)
+    itemsize = np.dtype(dtype).itemsize
+    return {
+        "elements_read": read,
+        "elements_written": written,
+        "seconds": seconds,
+        "elements_per_s": read / seconds if seconds else float("inf"),
+        "mb_per_s": read * itemsize / 1e6 / seconds if seconds else float("inf"),
+        "stopped_early": any(c < len(a) for c, a in zip(cursors, arrays))
+    }
+
+
+# =========================================================
+#        K-WAY VERSION (ANY NUMBER OF SORTED ARRAYS)
+# =========================================================
+# Heads of all arrays sit in a min-heap; the largest head is tracked on the
+# side. When the smallest head equals the largest, every head is equal and
+# the value is common. Duplicates are dropped by comparing with the last
+# value emitted. Steps use "arrays" / "ptrs" / "vals" in place of
+# A,B,C / i,j,k / Ai,Bj,Ck, everything else is the same as above.
+
+def common_k_steps(arrays):
+    arrays = [list(a) for a in arrays]
+    ptrs = [0] * len(arrays)
+    result = []
+    steps = []
+
+    def record(action):
+        steps.append({
+            "arrays": arrays,
+            "ptrs": ptrs[:],
+            "vals": [a[p] if p < len(a) else None for a, p in zip(arrays, ptrs)],
+            "result": result[:],
+            "action": action
+        })
+
+    if not arrays or any(not a for a in arrays):
+        record("An array is empty → nothing in common")
+        return steps
+
+    heap = [(a[0], r) for r, a in enumerate(arrays)]
+    heapq.heapify(heap)
+    largest = max(a[0] for a in arrays)
+
+    while True:
+        smallest, r = heap[0]
+
+        if smallest == largest:
+            if not result or result[-1] != smallest:
+                result.append(smallest)
+                record(f"All {len(arrays)} heads equal → {smallest} added")
+            else:
+                record(f"{smallest} same as last added → skip")
+            heap = []
+            for r2 in range(len(arrays)):
+                ptrs[r2] += 1
+                if ptrs[r2] == len(arrays[r2]):
+                    record(f"Array {_row_name(r2)} exhausted → done")
+                    return steps
+                heap.append((arrays[r2][ptrs[r2]], r2))
+            heapq.heapify(heap)
+            largest = max(v for v, _ in heap)
+        else:
+            record(f"{_row_name(r)}[{ptrs[r]}] = {smallest} is smallest → move it")
+            heapq.heappop(heap)
+            ptrs[r] += 1
+            if ptrs[r] == len(arrays[r]):
+                record(f"Array {_row_name(r)} exhausted → done")
+                return steps
+            v = arrays[r][ptrs[r]]
+            heapq.heappush(heap, (v, r))
+            largest = max(largest, v)
+
+
+def _row_name(r):
+    return chr(ord("A") + r) if r < 26 else f"#{r}"
+
+
 # =========================================================
 #                     DARK MODE VISUALS
 # =========================================================
 
+ROW_COLORS = ["#004488", "#AA5500", "#2B8A3E", "#7B2CBF", "#B5179E", "#0F7C80"]
+
+
 def draw_array(ax, arr, y, pointer_index, color, title):
     box_w = 1.1
     box_h = 0.8
@@ -117,29 +369,41 @@ def visualize_steps(steps):
     current_step = 0
 
     def draw():
+        step = steps[current_step]
+
+        # one row per array: A/B/C steps or k-way steps
+        if "arrays" in step:
+            rows = list(zip(step["arrays"], step["ptrs"]))
+        else:
+            rows = [(step["A"], step["i"]), (step["B"], step["j"]), (step["C"], step["k"])]
+        result_y = 8 - 3 * len(rows) - 0.5
+
         ax.clear()
         ax.set_xlim(-3, 25)
-        ax.set_ylim(-7, 12)
+        ax.set_ylim(result_y - 5.5, 12)
         ax.axis("off")
         ax.set_facecolor("#111111")
 
-        step = steps[current_step]
-
         # Arrays
-        draw_array(ax, step["A"], 8, step["i"],
-                   "#004488", "Array A")
-        draw_array(ax, step["B"], 5, step["j"],
-                   "#AA5500", "Array B")
-        draw_array(ax, step["C"], 2, step["k"],
-                   "#2B8A3E", "Array C")
+        for r, (arr, ptr) in enumerate(rows):
+            draw_array(ax, arr, 8 - 3 * r, ptr,
+                       ROW_COLORS[r % len(ROW_COLORS)], f"Array {_row_name(r)}")
+
+        # Galloping jump: shade the boxes that were skipped in one step
+        if "span" in step:
+            r, start, stop = step["span"]
+            if stop > start:
+                ax.add_patch(patches.Rectangle(
+                    (start * 1.6 - 0.35, 8 - 3 * r - 0.35), (stop - start) * 1.6 + 0.15, 1.5,
+                    facecolor="#FFDD55", alpha=0.18, edgecolor="#FFDD55", linewidth=1.5))
 
         # Result row
-        ax.text(-2.5, -1.5, "Result:",
+        ax.text(-2.5, result_y, "Result:",
                 fontsize=16, fontweight="bold", color="white")
 
         for idx, val in enumerate(step["result"]):
             rect = patches.FancyBboxPatch(
-                (idx * 1.5, -3),
+                (idx * 1.5, result_y - 1.5),
                 1.2, 0.8,
                 boxstyle="round,pad=0.25",
                 facecolor="#3CB043",
@@ -148,7 +412,7 @@ def visualize_steps(steps):
             )
             ax.add_patch(rect)
 
-            ax.text(idx * 1.5 + 0.6, -3 + 0.4,
+            ax.text(idx * 1.5 + 0.6, result_y - 1.5 + 0.4,
                     str(val), ha="center", va="center",
                     fontsize=14, fontweight="bold", color="white")
 
@@ -184,9 +448,10 @@ def visualize_steps(steps):
 #                     RUN
 # =========================================================
 
-A = [1, 5, 10, 20, 20, 40, 80]
-B = [6, 7, 20, 20, 80, 100]
-C = [3, 4, 15, 20, 20, 30, 70, 80, 120]
+if __name__ == "__main__":
+    A = [1, 5, 10, 20, 20, 40, 80]
+    B = [6, 7, 20, 20, 80, 100]
+    C = [3, 4, 15, 20, 20, 30, 70, 80, 120]
 
-steps = common_unique_steps(A, B, C)
-visualize_steps(steps)
+    steps = common_unique_steps(A, B, C)
+    visualize_steps(steps)
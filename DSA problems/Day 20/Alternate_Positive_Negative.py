@@ -1,58 +1,342 @@
+import os
+import queue
+import threading
+import time
 import tkinter as tk
+import tracemalloc
+import warnings
 from tkinter import font
 
+import numpy as np
+
+# cell geometry; only VISIBLE cells per row ever exist on the canvas
+BOX_W = 70
+GAP = 10
+START_X = 200
+VISIBLE = (1100 - START_X) // (BOX_W + GAP)
+
+# how often the Tk loop checks for worker results (ms)
+POLL_MS = 30
+
+# (title, step key, y, pointer key, pointer label)
+ROWS = [
+    ("ORIGINAL", "arr", 70, None, None),
+    ("POSITIVE", "pos", 170, "i", "i → pos"),
+    ("NEGATIVE", "neg", 280, "j", "j → neg"),
+    ("RESULT", "result", 390, "k", "k → result"),
+]
+
 # --------------------------------------------------
 # STEP GENERATOR (simple and clean)
 # --------------------------------------------------
 def generate_steps(arr):
+    trace = empty_trace(arr)
+    record_events(trace)
+    return trace
+
+
+def empty_trace(arr):
+    arr = list(arr)
     pos = [x for x in arr if x >= 0]
     neg = [x for x in arr if x < 0]
+    return StepTrace(arr, pos, neg, [], done=False)
+
 
-    result = [None] * len(arr)
-    steps = []
+def record_events(trace):
+    # one (k, source, index) placement event per step instead of
+    # four list copies; StepTrace rebuilds the view on demand.
+    # Events are appended in place so a viewer can page through the
+    # steps already recorded while a worker thread is still running.
+    events = trace.events
+    n = len(trace.arr)
+    n_pos = len(trace.pos)
+    n_neg = len(trace.neg)
 
     i = j = k = 0
 
-    steps.append({
-        "arr": arr.copy(),
-        "pos": pos.copy(),
-        "neg": neg.copy(),
-        "result": result.copy(),
-        "i": i, "j": j, "k": k,
-        "action": "Initialization complete"
-    })
-
-    while k < len(arr):
-        if k % 2 == 0 and i < len(pos):
-            result[k] = pos[i]
-            steps.append({
-                "arr": arr.copy(), "pos": pos.copy(), "neg": neg.copy(),
-                "result": result.copy(),
-                "i": i, "j": j, "k": k,
-                "action": f"Placed POS {pos[i]} at index {k}"
-            })
+    # once one side runs out the rest of the other side fills the
+    # remaining slots in order, so no element is dropped
+    while k < n:
+        if i < n_pos and (k % 2 == 0 or j == n_neg):
+            events.append((k, "pos", i))
             i += 1
 
-        elif k % 2 == 1 and j < len(neg):
-            result[k] = neg[j]
-            steps.append({
-                "arr": arr.copy(), "pos": pos.copy(), "neg": neg.copy(),
-                "result": result.copy(),
-                "i": i, "j": j, "k": k,
-                "action": f"Placed NEG {neg[j]} at index {k}"
-            })
+        else:
+            events.append((k, "neg", j))
             j += 1
 
         k += 1
 
-    steps.append({
-        "arr": arr.copy(), "pos": pos.copy(), "neg": neg.copy(),
-        "result": result.copy(),
-        "i": i, "j": j, "k": k,
-        "action": "Final result completed"
-    })
+    trace.done = True
+    return trace
+
+
+# --------------------------------------------------
+# FAST ARRAY PARSER ("[1, -2, 3]", "1 -2 3" or a file path)
+# --------------------------------------------------
+def parse_array(raw):
+    raw = raw.strip()
+    if os.path.isfile(raw):
+        with open(raw) as f:
+            raw = f.read().strip()
+
+    if raw.startswith("[") and raw.endswith("]"):
+        raw = raw[1:-1]
+    if not raw.strip():
+        return []
+
+    sep = "," if "," in raw else " "
+
+    # fromstring only warns on trailing junk; make that an error
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(raw, dtype=np.int64, sep=sep)
+            # out-of-range integers saturate to the int64 limits;
+            # confirm any value sitting on a limit exactly
+            info = np.iinfo(np.int64)
+            if ((values == info.max) | (values == info.min)).any():
+                for token in raw.replace(",", " ").split():
+                    if not info.min <= int(token) <= info.max:
+                        raise OverflowError
+        except OverflowError:
+            raise ValueError("values must fit in a 64-bit integer") from None
+        except (ValueError, DeprecationWarning):
+            try:
+                values = np.fromstring(raw, dtype=np.float64, sep=sep)
+            except DeprecationWarning as e:
+                raise ValueError(str(e)) from None
+            # astype would silently wrap inf / nan / huge values
+            if not (np.isfinite(values).all()
+                    and (values >= -2.0**63).all() and (values < 2.0**63).all()):
+                raise ValueError("values must fit in a 64-bit integer")
+            values = values.astype(np.int64)  # truncate like int()
+
+    return values.tolist()
+
 
-    return steps
+# --------------------------------------------------
+# STEP TRACE (arr / pos / neg stored once, result rebuilt per step)
+# --------------------------------------------------
+# Event k always fills result slot k, so everything a step shows follows
+# from the events alone: steps are independent read-only views and the
+# trace keeps no cursor.
+class ResultView:
+    # result row after the first `applied` events, read-only
+    def __init__(self, trace, applied):
+        self.trace = trace
+        self.applied = applied
+
+    def __len__(self):
+        return len(self.trace.arr)
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return [self[c] for c in range(*col.indices(len(self)))]
+        if col < 0:
+            col += len(self)
+        if not 0 <= col < len(self):
+            raise IndexError("result index out of range")
+
+        if col >= self.applied:
+            return None
+        _, src, idx = self.trace.events[col]
+        return self.trace.source[src][idx]
+
+    def __iter__(self):
+        for col in range(len(self)):
+            yield self[col]
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class StepTrace:
+    # step 0 is the initial view, step s shows events[s - 1] just placed,
+    # and the last step is the final result
+    def __init__(self, arr, pos, neg, events, done=True):
+        self.arr = arr
+        self.pos = pos
+        self.neg = neg
+        self.events = events
+        self.done = done
+
+        self.source = {"pos": pos, "neg": neg}
+
+    def __len__(self):
+        # the final view only exists once every event is recorded
+        return len(self.events) + (2 if self.done else 1)
+
+    def __getitem__(self, s):
+        if s < 0:
+            s += len(self)
+        if not 0 <= s < len(self):
+            raise IndexError("step index out of range")
+
+        applied = min(s, len(self.events))
+        step = {"arr": self.arr, "pos": self.pos, "neg": self.neg,
+                "result": ResultView(self, applied)}
+
+        if s == 0:
+            step.update(i=0, j=0, k=0, action="Initialization complete")
+        elif s > len(self.events):
+            step.update(i=len(self.pos), j=len(self.neg), k=len(self.arr),
+                        action="Final result completed")
+        else:
+            # k slots are filled before event k, idx of them from src
+            k, src, idx = self.events[s - 1]
+            i = idx if src == "pos" else k - idx
+            j = idx if src == "neg" else k - idx
+            step.update(i=i, j=j, k=k,
+                        action=f"Placed {src.upper()} {self.source[src][idx]} at index {k}")
+
+        return step
+
+
+# --------------------------------------------------
+# IN-PLACE ENGINE (order preserving, O(1) extra space)
+# --------------------------------------------------
+# Stable partition (positives first) and then a perfect shuffle of the
+# two blocks, both by divide and conquer with block rotations:
+# O(n log n) moves.  Rotations are three reversals done in chunks of at
+# most INPLACE_LEAF elements, and ranges that small are finished with a
+# buffer of the same size, so extra memory is a constant.
+INPLACE_LEAF = 4096
+
+
+def _reverse(a, lo, hi):
+    while hi - lo > 1:
+        c = min(INPLACE_LEAF, (hi - lo) // 2)
+        left = a[lo:lo + c].copy()
+        a[lo:lo + c] = a[hi - c:hi][::-1]
+        a[hi - c:hi] = left[::-1]
+        lo += c
+        hi -= c
+
+
+def _rotate(a, lo, mid, hi, steps, phase):
+    # a[lo:mid] a[mid:hi]  ->  a[mid:hi] a[lo:mid]
+    if lo == mid or mid == hi:
+        return
+    if steps is not None:
+        steps.append((phase, lo, mid, hi))
+    _reverse(a, lo, mid)
+    _reverse(a, mid, hi)
+    _reverse(a, lo, hi)
+
+
+def _stable_partition(a, lo, hi, leaf, steps):
+    # returns the index of the first negative in a[lo:hi]
+    if hi - lo <= leaf:
+        seg = a[lo:hi]
+        keep = seg >= 0
+        a[lo:hi] = np.concatenate((seg[keep], seg[~keep]))
+        return lo + int(keep.sum())
+
+    mid = (lo + hi) // 2
+    left = _stable_partition(a, lo, mid, leaf, steps)
+    right = _stable_partition(a, mid, hi, leaf, steps)
+
+    # [pos | neg][pos | neg]  ->  [pos pos | neg neg]
+    _rotate(a, left, mid, right, steps, "partition")
+    return left + (right - mid)
+
+
+def _interleave(a, lo, m, leaf, steps):
+    # a[lo:lo+m] = A, a[lo+m:lo+2m] = B  ->  A0 B0 A1 B1 ...
+    while m > 1:
+        if 2 * m <= leaf:
+            seg = a[lo:lo + 2 * m].copy()
+            a[lo:lo + 2 * m:2] = seg[:m]
+            a[lo + 1:lo + 2 * m:2] = seg[m:]
+            return
+
+        # A1 A2 B1 B2  ->  A1 B1 A2 B2, then shuffle both halves
+        h = m // 2
+        _rotate(a, lo + h, lo + m, lo + m + h, steps, "interleave")
+        _interleave(a, lo, h, leaf, steps)
+        lo += 2 * h
+        m -= h
+
+
+def rearrange_inplace(arr, steps=None):
+    # arr: NumPy array, rearranged in place (a list is copied first).
+    # steps, if given, collects one (phase, lo, mid, hi) per rotation;
+    # tracing turns off the buffered leaves so every move is a rotation.
+    a = arr if isinstance(arr, np.ndarray) else np.array(arr, dtype=np.int64)
+    leaf = 1 if steps is not None else INPLACE_LEAF
+    n = len(a)
+
+    p = _stable_partition(a, 0, n, leaf, steps)
+    m = min(p, n - p)
+
+    # P[:m] P[m:] N  ->  P[:m] N P[m:]; extra positives stay at the end
+    _rotate(a, m, p, n, steps, "leftover")
+
+    _interleave(a, 0, m, leaf, steps)
+    return a
+
+
+def rearrange_buffers(arr):
+    # trace-free three-buffer version of generate_steps
+    pos = [x for x in arr if x >= 0]
+    neg = [x for x in arr if x < 0]
+
+    m = min(len(pos), len(neg))
+    result = []
+    for i in range(m):
+        result.append(pos[i])
+        result.append(neg[i])
+    result.extend(pos[m:])
+    result.extend(neg[m:])
+    return result
+
+
+def rearrange_numpy(arr):
+    # trace-free batch version: boolean masks + strided interleave,
+    # leftovers appended in order exactly like generate_steps
+    a = np.asarray(arr)
+    mask = a >= 0
+    pos = a[mask]
+    np.logical_not(mask, out=mask)  # reuse the mask for the negatives
+    neg = a[mask]
+    del mask
+
+    m = min(len(pos), len(neg))
+    out = np.empty_like(a)
+    out[0:2 * m:2] = pos[:m]
+    out[1:2 * m:2] = neg[:m]
+    out[2 * m:] = pos[m:] if len(pos) > m else neg[m:]
+    return out
+
+
+def compare_rearrange_engines(n=10**6, seed=0):
+    rng = np.random.default_rng(seed)
+    data = rng.integers(-10**6, 10**6, size=n)
+    as_list = data.tolist()
+
+    report = {"n": n}
+    for name, run, arg in (("buffers", rearrange_buffers, as_list),
+                           ("numpy", rearrange_numpy, data),
+                           ("inplace", rearrange_inplace, data)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        out = run(arg)
+        report[name + "_sec"] = time.perf_counter() - start
+        report[name + "_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report[name] = out
+
+    expected = report.pop("buffers")
+    report["match"] = (report.pop("numpy").tolist() == expected
+                       and report.pop("inplace").tolist() == expected)
+    return report
 
 
 # --------------------------------------------------
@@ -69,6 +353,12 @@ class VisualizerApp:
         self.steps = generate_steps(self.arr)
         self.index = 0
 
+        # background loader hands results back through this queue
+        self.loaded = queue.Queue()
+        self.load_id = 0
+        self.loading = False
+        self.polling = False
+
         # fonts
         self.title_font = font.Font(family="Arial", size=14, weight="bold")
         self.text_font = font.Font(family="Arial", size=12)
@@ -76,43 +366,81 @@ class VisualizerApp:
 
         # canvas
         self.canvas = tk.Canvas(root, width=1100, height=700, bg="#111111", highlightthickness=0)
-        self.canvas.pack(padx=10, pady=10)
+        self.canvas.pack(padx=10, pady=(10, 0))
+
+        self.hbar = tk.Scrollbar(root, orient="horizontal", command=self.on_scroll)
+        self.hbar.pack(fill="x", padx=10, pady=(0, 10))
 
         # bottom panel
         self.build_controls()
 
         # draw initial
+        self.build_canvas()
         self.draw_step()
 
     # --------------------------------------------------
-    # load user array
+    # load user array (parsed and traced on a worker thread)
     # --------------------------------------------------
     def load_array(self):
-        raw = self.entry.get().strip()
+        raw = self.entry.get()
+        self.load_id += 1
+        self.loading = True
+        threading.Thread(target=self.load_worker, args=(raw, self.load_id),
+                         daemon=True).start()
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_MS, self.poll_loader)
+
+    def load_worker(self, raw, load_id):
         try:
-            arr = eval(raw, {"__builtins__": None}, {})
-            if not isinstance(arr, list):
-                raise ValueError
-
-            clean = []
-            for v in arr:
-                clean.append(int(v))  # SIMPLE SAFE CONVERSION
-
-            self.arr = clean
-            self.steps = generate_steps(self.arr)
-            self.index = 0
-            self.draw_step()
+            trace = empty_trace(parse_array(raw))
+        except (ValueError, OSError):
+            self.loaded.put((load_id, "error", None))
+            return
+
+        # first frame only needs arr / pos / neg
+        self.loaded.put((load_id, "first", trace))
+        record_events(trace)
+        self.loaded.put((load_id, "done", trace))
+
+    def poll_loader(self):
+        while True:
+            try:
+                load_id, kind, trace = self.loaded.get_nowait()
+            except queue.Empty:
+                break
+            if load_id != self.load_id:
+                continue  # superseded by a newer Load / Reset
+
+            if kind == "error":
+                self.flash("Invalid array. Example: [1, -2, 3, -4] or a file path")
+                self.loading = False
+            elif kind == "first":
+                self.arr = trace.arr
+                self.steps = trace
+                self.index = 0
+                self.build_canvas()
+            else:
+                self.loading = False
+
+        # refresh the step counter while events are still arriving
+        self.draw_step()
 
-        except:
-            self.flash("Invalid array. Example: [1, -2, 3, -4]")
+        if self.loading:
+            self.root.after(POLL_MS, self.poll_loader)
+        else:
+            self.polling = False
 
     # --------------------------------------------------
     def reset(self):
+        self.load_id += 1
+        self.loading = False
         self.arr = [1, -3, 5, -2, 7, -8, 9, -6]
         self.entry.delete(0, tk.END)
         self.entry.insert(0, str(self.arr))
         self.steps = generate_steps(self.arr)
         self.index = 0
+        self.build_canvas()
         self.draw_step()
 
     # --------------------------------------------------
@@ -147,72 +475,141 @@ class VisualizerApp:
     def next_step(self):
         if self.index < len(self.steps) - 1:
             self.index += 1
+            self.follow(self.steps[self.index]["k"])
             self.draw_step()
 
     def prev_step(self):
         if self.index > 0:
             self.index -= 1
+            self.follow(self.steps[self.index]["k"])
             self.draw_step()
 
     # --------------------------------------------------
-    # DRAW ROW OF BOXES
+    # CANVAS ITEMS (built once per loaded array)
     # --------------------------------------------------
-    def draw_row(self, title, arr, y, ptr=None, label=None):
-        self.canvas.create_text(40, y + 25, anchor="w", text=title,
-                                font=self.text_font, fill="white")
-
-        box_w = 70
-        start_x = 200
-        gap = 10
-
-        for i, val in enumerate(arr):
-            x1 = start_x + i * (box_w + gap)
-            x2 = x1 + box_w
-            y1 = y
-            y2 = y + 50
-
-            self.canvas.create_rectangle(x1, y1, x2, y2, outline="white", width=2)
-            txt = "_" if val is None else str(val)
-            self.canvas.create_text((x1 + x2) // 2, y1 + 25, text=txt,
-                                    font=self.text_font, fill="#00FFFF")
-
-            if ptr == i:
-                self.canvas.create_text((x1 + x2) // 2, y2 + 15, text=label,
-                                        font=self.small_font, fill="#FFFF00")
-
-    # --------------------------------------------------
-    def draw_step(self):
+    def build_canvas(self):
         self.canvas.delete("all")
-
-        step = self.steps[self.index]
+        self.offset = 0
 
         # header
         self.canvas.create_text(550, 20, text="Alternate Positive-Negative ",
                                 font=self.title_font, fill="white")
 
-        # draw arrays
-        self.draw_row("ORIGINAL", step["arr"], 70)
-        self.draw_row("POSITIVE", step["pos"], 170,
-                      ptr=step["i"] if step["i"] < len(step["pos"]) else None,
-                      label="i → pos")
-        self.draw_row("NEGATIVE", step["neg"], 280,
-                      ptr=step["j"] if step["j"] < len(step["neg"]) else None,
-                      label="j → neg")
-        self.draw_row("RESULT", step["result"], 390,
-                      ptr=step["k"] if step["k"] < len(step["result"]) else None,
-                      label="k → result")
+        # one pool of VISIBLE cells per row; scrolling only retexts them
+        self.cells = {}
+        self.cell_text = {}
+        self.pointers = {}
+        for title, key, y, ptr_key, label in ROWS:
+            self.canvas.create_text(40, y + 25, anchor="w", text=title,
+                                    font=self.text_font, fill="white")
+
+            slots = []
+            for s in range(VISIBLE):
+                x1 = START_X + s * (BOX_W + GAP)
+                x2 = x1 + BOX_W
+                rect = self.canvas.create_rectangle(x1, y, x2, y + 50, outline="white",
+                                                    width=2, state="hidden")
+                txt = self.canvas.create_text((x1 + x2) // 2, y + 25, text="",
+                                              font=self.text_font, fill="#00FFFF",
+                                              state="hidden")
+                slots.append((rect, txt))
+            self.cells[key] = slots
+            self.cell_text[key] = [None] * VISIBLE
+
+            if ptr_key is not None:
+                self.pointers[key] = self.canvas.create_text(0, y + 65, text=label,
+                                                             font=self.small_font,
+                                                             fill="#FFFF00", state="hidden")
 
         # action box
         self.canvas.create_rectangle(180, 520, 1000, 580,
                                      outline="#FF9900", width=2)
-        self.canvas.create_text(190, 550, anchor="w",
-                                text=f"Step: {step['action']}",
-                                font=self.text_font, fill="#FFA500")
+        self.action_text = self.canvas.create_text(190, 550, anchor="w", text="",
+                                                   font=self.text_font, fill="#FFA500")
 
         # footer (step number)
-        self.canvas.create_text(900, 550,
-                                text=f"{self.index + 1} / {len(self.steps)}",
-                                font=self.text_font, fill="white")
+        self.footer_text = self.canvas.create_text(900, 550, text="",
+                                                   font=self.text_font, fill="white")
+
+    # --------------------------------------------------
+    # horizontal scrolling
+    # --------------------------------------------------
+    def scroll_to(self, col):
+        last = max(0, len(self.arr) - VISIBLE)
+        self.offset = min(max(0, col), last)
+
+    def follow(self, col):
+        # keep the cell the step is writing on screen
+        if col < self.offset:
+            self.scroll_to(col)
+        elif col >= self.offset + VISIBLE:
+            self.scroll_to(col - VISIBLE + 1)
+
+    def on_scroll(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.arr)))
+        elif args[0] == "scroll":
+            page = VISIBLE if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * page)
+        self.draw_step()
+
+    # --------------------------------------------------
+    # UPDATE ROW OF BOXES
+    # --------------------------------------------------
+    def update_row(self, key, values, ptr=None):
+        shown = self.cell_text[key]
+
+        for s, (rect, txt) in enumerate(self.cells[key]):
+            col = self.offset + s
+            if col < len(values):
+                val = values[col]
+                new = "_" if val is None else str(val)
+            else:
+                new = None
+
+            if new == shown[s]:
+                continue
+            if new is None:
+                self.canvas.itemconfig(rect, state="hidden")
+                self.canvas.itemconfig(txt, state="hidden")
+            else:
+                if shown[s] is None:
+                    self.canvas.itemconfig(rect, state="normal")
+                self.canvas.itemconfig(txt, text=new, state="normal")
+            shown[s] = new
+
+        if key in self.pointers:
+            label = self.pointers[key]
+            s = -1 if ptr is None else ptr - self.offset
+            if 0 <= s < VISIBLE:
+                x = START_X + s * (BOX_W + GAP) + BOX_W // 2
+                _, y = self.canvas.coords(label)
+                self.canvas.coords(label, x, y)
+                self.canvas.itemconfig(label, state="normal")
+            else:
+                self.canvas.itemconfig(label, state="hidden")
+
+    # --------------------------------------------------
+    def draw_step(self):
+        step = self.steps[self.index]
+
+        # draw arrays
+        self.update_row("arr", step["arr"])
+        self.update_row("pos", step["pos"],
+                        ptr=step["i"] if step["i"] < len(step["pos"]) else None)
+        self.update_row("neg", step["neg"],
+                        ptr=step["j"] if step["j"] < len(step["neg"]) else None)
+        self.update_row("result", step["result"],
+                        ptr=step["k"] if step["k"] < len(step["result"]) else None)
+
+        self.canvas.itemconfig(self.action_text, text=f"Step: {step['action']}")
+        more = "" if self.steps.done else "+"
+        self.canvas.itemconfig(self.footer_text,
+                               text=f"{self.index + 1} / {len(self.steps)}{more}")
+
+        # scrollbar thumb covers the visible columns
+        n = max(1, len(self.arr))
+        self.hbar.set(self.offset / n, min(1.0, (self.offset + VISIBLE) / n))
 
 
 # --------------------------------------------------
@@ -1,8 +1,17 @@
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.widgets import Button
 
-def visualize_zero_sum_subarray(arr):
+# hash map rows shown at once in the side panel
+MAP_WINDOW = 8
+
+
+def zero_sum_steps(arr):
+    # The hash map is kept as an insertion-ordered log of
+    # (prefix sum, index) pairs: the map at any step is just the first
+    # `count` entries, so each step stores a length instead of a copy.
     steps = []
+    log = []
     prefix_sum = 0
     hashmap = {}
     found = False
@@ -25,25 +34,33 @@ def visualize_zero_sum_subarray(arr):
         else:
             explanation += "\nStored prefix sum into hashmap."
 
-        snapshot = dict(hashmap)
-        snapshot[prefix_sum] = idx
+        # (count of log entries, pending entry shown after them)
+        if found:
+            view = (len(log), (prefix_sum, idx))
+        else:
+            hashmap[prefix_sum] = idx
+            log.append((prefix_sum, idx))
+            view = (len(log), None)
 
-        steps.append((arr[:], snapshot, idx, prefix_sum, explanation, result_range))
+        steps.append((view, idx, prefix_sum, explanation, result_range))
 
         if found:
             break
 
-        hashmap[prefix_sum] = idx
-
     if not found:
-        steps.append((arr[:], hashmap.copy(), -1, prefix_sum, "❌ No Zero-Sum Subarray Exists.", None))
+        steps.append(((len(log), None), -1, prefix_sum, "❌ No Zero-Sum Subarray Exists.", None))
+
+    return steps, log
 
 
+def visualize_zero_sum_subarray(arr):
+    steps, log = zero_sum_steps(arr)
+
     # ---- Visualization ----
     plt.style.use('dark_background')
     fig, ax = plt.subplots(figsize=(13, 5))
     plt.subplots_adjust(bottom=0.23)
-    current = {'index': 0}
+    current = {'index': 0, 'map_scroll': 0}
 
     # Colors
     ACTIVE_COLOR = "#FFD166"     # Amber
@@ -51,9 +68,22 @@ def visualize_zero_sum_subarray(arr):
     NORMAL_COLOR = "#118AB2"     # Soft Blue
 
 
+    def map_panel(view):
+        # window of MAP_WINDOW rows ending `map_scroll` rows before the newest
+        count, pending = view
+        total = count + (pending is not None)
+        stop = max(0, total - current['map_scroll'])
+        start = max(0, stop - MAP_WINDOW)
+
+        lines = [f"{k} → {v}" for k, v in log[start:min(stop, count)]]
+        if pending is not None and stop > count:
+            lines.append(f"{pending[0]} → {pending[1]}   ◀ current")
+        return lines, start, stop, total
+
     def draw(step_index):
         ax.clear()
-        arr_vals, map_vals, idx, p_sum, text, rrange = steps[step_index]
+        view, idx, p_sum, text, rrange = steps[step_index]
+        arr_vals = arr
 
         ax.set_title("🔍 Detecting Subarray With Zero Sum", fontsize=16, pad=20, color="white")
 
@@ -74,13 +104,14 @@ def visualize_zero_sum_subarray(arr):
         for i in range(len(arr_vals)):
             ax.text(i, 1.45, f"{i}", ha="center", fontsize=10, color="#BBBBBB")
 
-        # Hashmap Display
-        ax.text(-1.5, -0.2, "📌 Hash Map (Prefix Sum → Index)", fontsize=12, color="#FFD166", weight="bold")
-        
-        y_offset = -0.6
-        for k, v in map_vals.items():
-            ax.text(-1.5, y_offset, f"{k} → {v}", fontsize=11, color="#8ecae6")
-            y_offset -= 0.35
+        # Hashmap Display (one text artist for the visible window)
+        lines, start, stop, total = map_panel(view)
+        header = "📌 Hash Map (Prefix Sum → Index)"
+        if total > MAP_WINDOW:
+            header += f"  [{start + 1}–{stop} of {total}, ↑/↓ scroll]"
+        ax.text(-1.5, -0.2, header, fontsize=12, color="#FFD166", weight="bold")
+        ax.text(-1.5, -0.45, "\n".join(lines), fontsize=11, color="#8ecae6",
+                va="top", linespacing=1.6)
 
         # Explanation text
         ax.text(len(arr_vals)/2, -2.2, text, ha="center", fontsize=12, wrap=True, color="white")
@@ -95,13 +126,23 @@ def visualize_zero_sum_subarray(arr):
     def next_step(event=None):
         if current['index'] < len(steps) - 1:
             current['index'] += 1
+            current['map_scroll'] = 0
             draw(current['index'])
 
     def prev_step(event=None):
         if current['index'] > 0:
             current['index'] -= 1
+            current['map_scroll'] = 0
             draw(current['index'])
 
+    # scroll the hash map panel back towards older entries
+    def scroll_map(delta):
+        view = steps[current['index']][0]
+        total = view[0] + (view[1] is not None)
+        limit = max(0, total - MAP_WINDOW)
+        current['map_scroll'] = min(max(0, current['map_scroll'] + delta), limit)
+        draw(current['index'])
+
 
     # ---- Keyboard Support ----
     def on_key(event):
@@ -109,8 +150,16 @@ def visualize_zero_sum_subarray(arr):
             next_step()
         elif event.key == "left":
             prev_step()
+        elif event.key == "up":
+            scroll_map(1)
+        elif event.key == "down":
+            scroll_map(-1)
+
+    def on_scroll(event):
+        scroll_map(1 if event.button == "up" else -1)
 
     fig.canvas.mpl_connect("key_press_event", on_key)
+    fig.canvas.mpl_connect("scroll_event", on_scroll)
 
 
     # ---- Create UI Buttons ----
@@ -141,6 +190,198 @@ def visualize_zero_sum_subarray(arr):
     plt.show()
 
 
+# ---- All subarrays with sum K (vectorized) ----
+def _as_numbers(arr):
+    # integers stay exact in int64; anything else is summed as float64,
+    # compared with == just like the hash map walk above
+    values = np.asarray(arr)
+    if values.dtype.kind in "bui":
+        return values.astype(np.int64)
+    if values.dtype.kind == "f" or values.size == 0:
+        return values.astype(np.float64)
+    raise ValueError("arr must contain only numbers")
+
+
+def _sum_k_ends(arr, k):
+    # prefix[j] - prefix[i] == k  <=>  arr[i:j] sums to k.
+    # Equal prefixes are grouped with np.unique; `order` lists the
+    # positions of each group in ascending order, so the number of
+    # valid starts for end j is a rank inside the group of prefix[j] - k.
+    values = _as_numbers(arr)
+    n = len(values)
+    prefix = np.zeros(n + 1, dtype=values.dtype)
+    np.cumsum(values, out=prefix[1:])
+
+    uniq, inv = np.unique(prefix, return_inverse=True)
+    order = np.argsort(inv, kind="stable")
+    sizes = np.bincount(inv, minlength=len(uniq))
+    group_start = np.cumsum(sizes) - sizes
+
+    want = prefix[1:] - k
+    g = np.minimum(np.searchsorted(uniq, want), len(uniq) - 1)
+    present = uniq[g] == want
+
+    # rank of end j among the group's positions = starts i < j
+    ends = np.arange(1, n + 1)
+    key = inv[order] * (n + 1) + order
+    below = np.searchsorted(key, g * (n + 1) + ends) - group_start[g]
+    below[~present] = 0
+    return below, group_start[g], order, prefix
+
+
+def count_sum_k(arr, k=0):
+    if len(arr) == 0:
+        return 0
+    below = _sum_k_ends(arr, k)[0]
+    return int(below.sum())
+
+
+def enumerate_sum_k(arr, k=0):
+    # all (start, end) inclusive ranges with sum k, ordered by end then
+    # start; O(n + output) on top of the grouping
+    if len(arr) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    below, first, order, _ = _sum_k_ends(arr, k)
+
+    total = int(below.sum())
+    ends = np.repeat(np.arange(len(arr)), below)
+    offsets = np.arange(total) - np.repeat(np.cumsum(below) - below, below)
+    starts = order[np.repeat(first, below) + offsets]
+    return np.column_stack((starts, ends))
+
+
+def visualize_sum_k_matches(arr, k=0):
+    matches = enumerate_sum_k(arr, k)
+    prefix = np.concatenate(([0], np.cumsum(_as_numbers(arr))))
+
+    plt.style.use('dark_background')
+    fig, ax = plt.subplots(figsize=(13, 5))
+    plt.subplots_adjust(bottom=0.23)
+    current = {'index': 0}
+
+    FOUND_COLOR = "#06D6A0"      # Teal
+    NORMAL_COLOR = "#118AB2"     # Soft Blue
+
+    def draw(page):
+        ax.clear()
+        ax.set_title(f"🔍 All Subarrays With Sum {k} — {len(matches)} found",
+                     fontsize=16, pad=20, color="white")
+
+        if len(matches):
+            lo, hi = (int(v) for v in matches[page])
+            text = (f"Match {page + 1} / {len(matches)}: arr[{lo}..{hi}] "
+                    f"→ prefix[{hi + 1}] - prefix[{lo}] = {prefix[hi + 1]} - {prefix[lo]} = {k}")
+        else:
+            lo, hi = -1, -2
+            text = f"❌ No subarray sums to {k}."
+
+        for i, val in enumerate(arr):
+            color = FOUND_COLOR if lo <= i <= hi else NORMAL_COLOR
+            ax.text(i, 1, str(val), ha="center", va="center",
+                    bbox=dict(facecolor=color, edgecolor='white', boxstyle='round,pad=0.45'),
+                    fontsize=13, color="black")
+            ax.text(i, 1.45, f"{i}", ha="center", fontsize=10, color="#BBBBBB")
+
+        ax.text(len(arr)/2, -1.2, text, ha="center", fontsize=12, wrap=True, color="white")
+
+        ax.set_xlim(-2, len(arr) + 2)
+        ax.set_ylim(-3, 3)
+        ax.axis("off")
+        plt.draw()
+
+    def next_match(event=None):
+        if current['index'] < len(matches) - 1:
+            current['index'] += 1
+            draw(current['index'])
+
+    def prev_match(event=None):
+        if current['index'] > 0:
+            current['index'] -= 1
+            draw(current['index'])
+
+    def on_key(event):
+        if event.key == "right":
+            next_match()
+        elif event.key == "left":
+            prev_match()
+
+    fig.canvas.mpl_connect("key_press_event", on_key)
+
+    axprev = plt.axes([0.33, 0.05, 0.12, 0.07])
+    axnext = plt.axes([0.55, 0.05, 0.12, 0.07])
+    bnext = Button(axnext, 'Next Match ➡️')
+    bprev = Button(axprev, '⬅️ Prev Match')
+    bnext.ax.set_facecolor("#06D6A0")
+    bnext.label.set_color("black")
+    bprev.ax.set_facecolor("#FFD166")
+    bprev.label.set_color("black")
+    for btn in [bnext, bprev]:
+        for spine in btn.ax.spines.values():
+            spine.set_edgecolor("white")
+            spine.set_linewidth(1.3)
+    bnext.on_clicked(next_match)
+    bprev.on_clicked(prev_match)
+
+    draw(0)
+    plt.show()
+
+
+# ---- Streaming: zero-sum subarrays of length <= W ----
+class WindowedZeroSum:
+    # Only the last `window` prefix sums can start a short enough
+    # subarray, so they live in a ring buffer and a hash map of
+    # prefix sum → [count, latest index]; the oldest is evicted on
+    # every push and memory stays O(window) for an unbounded stream.
+    # push() returns a match only when one ends at the new element.
+    def __init__(self, window, k=0):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.k = k
+        self.i = -1
+        self.prefix_sum = 0
+        self.ring = [None] * window
+        self.hashmap = {}
+
+    def push(self, num):
+        self.i += 1
+
+        # prefix before this element is a start candidate for it
+        slot = self.i % self.window
+        old = self.ring[slot]
+        if old is not None:
+            entry = self.hashmap[old]
+            entry[0] -= 1
+            if entry[0] == 0:
+                del self.hashmap[old]
+        self.ring[slot] = self.prefix_sum
+        entry = self.hashmap.setdefault(self.prefix_sum, [0, 0])
+        entry[0] += 1
+        entry[1] = self.i
+
+        self.prefix_sum += num
+        entry = self.hashmap.get(self.prefix_sum - self.k)
+        if entry is None:
+            return None
+        return {
+            "start": entry[1],          # shortest match ending here
+            "end": self.i,
+            "matches": entry[0],        # all matches ending here
+            "prefix_sum": self.prefix_sum
+        }
+
+
+def stream_zero_sum(values, window, k=0):
+    # values: any iterable / generator of numbers
+    engine = WindowedZeroSum(window, k)
+    for num in values:
+        match = engine.push(num)
+        if match is not None:
+            yield match
+
+
 # ---- Example ----
-arr = [4, 2, 6, -3, 1, 6, -4, -3, 2, -5, 4]
-visualize_zero_sum_subarray(arr)
+if __name__ == "__main__":
+    arr = [4, 2, 6, -3, 1, 6, -4, -3, 2, -5, 4]
+    visualize_zero_sum_subarray(arr)
+    visualize_sum_k_matches(arr, 0)
@@ -1,7 +1,21 @@
+import decimal
+import math
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button
 import matplotlib.patches as patches
 import matplotlib as mpl
+import numpy as np
+from matplotlib.colors import ListedColormap
+
+try:
+    import gmpy2
+except ImportError:  # plain Python ints still work, just slower
+    gmpy2 = None
 
 # ===============================
 # Global UI Theme (Dark)
@@ -15,7 +29,17 @@ mpl.rcParams['font.weight'] = 'bold'
 # ===============================
 # Factorial Logic With Steps
 # ===============================
-def factorial_steps(n):
+# trace granularity: one step per decimal digit update (the classroom
+# view), one step per multiplier, or just the start and final result
+TRACE_MODES = ("digit", "multiplier", "final")
+
+
+def factorial_steps(n, trace="digit"):
+    if trace not in TRACE_MODES:
+        raise ValueError(f"trace must be one of {TRACE_MODES}")
+    if trace != "digit":
+        return limb_steps(n, per_multiplier=(trace == "multiplier"))
+
     steps = []
     result = [1]
 
@@ -106,13 +130,359 @@ def factorial_steps(n):
     return steps
 
 
+# ===============================
+# Base 10^9 Limb Engine
+# ===============================
+# Nine decimal digits per array('I') slot, least significant first:
+# 9x fewer inner-loop iterations than one digit per list element and
+# 4 bytes per limb when a step keeps a copy.
+LIMB_BASE = 10**9
+LIMB_DIGITS = 9
+
+
+def multiply_limbs(limbs, mul):
+    carry = 0
+    for i in range(len(limbs)):
+        product = limbs[i] * mul + carry
+        limbs[i] = product % LIMB_BASE
+        carry = product // LIMB_BASE
+
+    while carry:
+        limbs.append(carry % LIMB_BASE)
+        carry //= LIMB_BASE
+
+
+def factorial_limbs(n, steps=None):
+    limbs = array('I', [1])
+
+    for mul in range(2, n + 1):
+        multiply_limbs(limbs, mul)
+
+        if steps is not None:
+            steps.append({
+                "status": "cycle-complete",
+                "limbs": array('I', limbs),
+                "carry": 0,
+                "digit": None,
+                "multiplier": mul,
+                "expression": f"result × {mul} ({len(limbs)} limbs of 10^9)",
+                "message": f"Completed step with {mul}"
+            })
+
+    return limbs
+
+
+def limbs_to_digits(limbs):
+    # little-endian decimal digits, same layout as the digit engine
+    digits = []
+    last = len(limbs) - 1
+    for i, limb in enumerate(limbs):
+        for _ in range(LIMB_DIGITS):
+            digits.append(limb % 10)
+            limb //= 10
+            if i == last and limb == 0:
+                break
+    return digits
+
+
+def limbs_to_str(limbs):
+    head = str(limbs[-1])
+    return head + "".join(str(limb).zfill(LIMB_DIGITS) for limb in reversed(limbs[:-1]))
+
+
+def limb_steps(n, per_multiplier=True):
+    steps = [{
+        "status": "start",
+        "limbs": array('I', [1]),
+        "carry": 0,
+        "digit": None,
+        "multiplier": None,
+        "expression": "",
+        "message": f"Starting computation of {n}! Initial value: 1"
+    }]
+
+    limbs = factorial_limbs(n, steps if per_multiplier else None)
+
+    steps.append({
+        "status": "done",
+        "limbs": limbs,
+        "carry": 0,
+        "digit": None,
+        "multiplier": None,
+        "expression": "",
+        "message": f"Final Result Ready"
+    })
+
+    return steps
+
+
+def step_digits(step):
+    # digit steps carry "result"; limb steps derive digits for display
+    if "result" in step:
+        return step["result"]
+    return limbs_to_digits(step["limbs"])
+
+
+# ===============================
+# Product Tree Engine (large n)
+# ===============================
+# n! = product of balanced ranges: workers multiply the leaf ranges by
+# binary splitting, the parent multiplies their results pairwise so
+# every multiplication has operands of similar size.
+PRODUCT_SMALL = 16      # below this many factors multiply directly
+LEAVES_PER_WORKER = 4
+
+
+def range_product(lo, hi):
+    # product of lo .. hi-1
+    if hi - lo <= PRODUCT_SMALL:
+        p = gmpy2.mpz(1) if gmpy2 else 1
+        for x in range(lo, hi):
+            p *= x
+        return p
+    mid = (lo + hi) // 2
+    return range_product(lo, mid) * range_product(mid, hi)
+
+
+def _range_product_args(bounds):
+    return range_product(*bounds)
+
+
+def int_to_decimal_str(x):
+    # str(int) is capped by sys.set_int_max_str_digits (3.11+) and is
+    # quadratic before 3.12.  Splitting on powers of two and rebuilding
+    # in `decimal`, whose big multiplications are subquadratic, needs
+    # neither str(int) on a big value nor touching the global limit.
+    if gmpy2 is not None:
+        return gmpy2.mpz(x).digits()
+
+    x = int(x)
+    if x < 0:
+        return "-" + int_to_decimal_str(-x)
+
+    ctx = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX)
+    powers = {}
+
+    def pow2(w):
+        if w not in powers:
+            powers[w] = decimal.Decimal(2) ** w
+        return powers[w]
+
+    def inner(v, w):
+        # v < 2**w
+        if w <= 2048:
+            return decimal.Decimal(v)
+        w2 = w >> 1
+        hi = v >> w2
+        lo = v - (hi << w2)
+        return inner(lo, w2) + inner(hi, w - w2) * pow2(w2)
+
+    with decimal.localcontext(ctx):
+        return str(inner(x, x.bit_length()))
+
+
+def factorial_product_tree(n, workers=None, to_decimal=True):
+    workers = workers or os.cpu_count() or 1
+    report = {"n": n, "workers": workers, "gmpy2": gmpy2 is not None}
+
+    # phase 1: leaf ranges
+    t0 = time.perf_counter()
+    chunks = max(1, min(workers * LEAVES_PER_WORKER, (n - 1) // PRODUCT_SMALL))
+    edges = [2 + (n - 1) * c // chunks for c in range(chunks + 1)]
+    bounds = [(lo, hi) for lo, hi in zip(edges, edges[1:]) if lo < hi]
+
+    if workers <= 1 or len(bounds) <= 1:
+        level = [range_product(lo, hi) for lo, hi in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            level = list(pool.map(_range_product_args, bounds))
+    t1 = time.perf_counter()
+
+    # phase 2: pairwise reduction of the leaf products
+    while len(level) > 1:
+        nxt = [level[k] * level[k + 1] for k in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    value = level[0] if level else 1
+    t2 = time.perf_counter()
+
+    # phase 3: decimal expansion
+    report["digits"] = int_to_decimal_str(value) if to_decimal else None
+    t3 = time.perf_counter()
+
+    report.update(value=value, leaves_s=t1 - t0, combine_s=t2 - t1, decimal_s=t3 - t2)
+    return report
+
+
+def check_product_tree(max_n=60, workers=2):
+    # cross-check the product tree against the original per-digit engine
+    # and the limb engine
+    for n in range(max_n + 1):
+        tree = factorial_product_tree(n, workers)["digits"]
+        digits = "".join(map(str, factorial_steps(n)[-1]["result"][::-1]))
+        if tree != digits:
+            raise AssertionError(f"{n}!: product tree {tree} != digit engine {digits}")
+        limbs = limbs_to_str(factorial_limbs(n))
+        if tree != limbs:
+            raise AssertionError(f"{n}!: product tree {tree} != limb engine {limbs}")
+    return True
+
+
+# ===============================
+# Analytic Queries (no expansion)
+# ===============================
+def legendre(n, p):
+    # exponent of prime p in n!, O(log_p n)
+    e = 0
+    while n:
+        n //= p
+        e += n
+    return e
+
+
+def trailing_zeros(n):
+    # 10 = 2 * 5 and 5 is the rarer factor
+    return legendre(n, 5)
+
+
+def factorial_mod(n, p):
+    # n! mod prime p.  Past p it is 0; above p/2 Wilson's theorem
+    # (p-1)! = -1 turns it into the shorter product (n+1)..(p-1),
+    # so the cost is O(min(n, p - n)) multiplications.
+    if n >= p:
+        return 0
+    if n < p - 1 - n:
+        r = 1
+        for x in range(2, n + 1):
+            r = r * x % p
+        return r
+
+    tail = 1
+    for x in range(n + 1, p):
+        tail = tail * x % p
+    return (p - 1) * pow(tail, -1, p) % p
+
+
+def factorial_mod_unit(n, p):
+    # Lucas-style split n! = p^e * u with u coprime to p; returns
+    # (u mod p, e) using n! = (-1)^(n//p) * (n mod p)! * (n//p)! * p^(n//p)
+    u, e = 1, 0
+    while n > 1:
+        if (n // p) % 2:
+            u = p - u
+        u = u * factorial_mod(n % p, p) % p
+        n //= p
+        e += n
+    return u % p, e
+
+
+def digit_count(n):
+    # Kamenetsky's formula in floats while n * log10(n) still has spare
+    # precision, the decimal Stirling series beyond that
+    if n < 2:
+        return 1
+    if n < KAMENETSKY_MAX_N:
+        return math.floor(n * math.log10(n / math.e) + math.log10(2 * math.pi * n) / 2) + 1
+    return int(log10_factorial(n, len(str(n)) + 20)) + 1
+
+
+# pi to 60 digits for the Stirling series below
+_PI = decimal.Decimal("3.14159265358979323846264338327950288419716939937510582097494")
+_STIRLING = [(1, 12), (-1, 360), (1, 1260), (-1, 1680), (1, 1188), (-691, 360360), (1, 156)]
+STIRLING_MIN_N = 1000
+KAMENETSKY_MAX_N = 10**12
+
+
+def log10_factorial(n, prec=40):
+    # log10(n!) to about `prec` significant digits via the Stirling series
+    with decimal.localcontext() as ctx:
+        ctx.prec = prec + 10
+        D = decimal.Decimal
+        x = D(n)
+        ln = x * x.ln() - x + (2 * _PI * x).ln() / 2
+        for k, (num, den) in enumerate(_STIRLING):
+            ln += D(num) / (D(den) * x ** (2 * k + 1))
+        return +(ln / D(10).ln())
+
+
+def leading_digits(n, k=10):
+    # first k digits of n! from the fractional part of log10(n!)
+    if n < STIRLING_MIN_N:
+        return int(limbs_to_str(factorial_limbs(n))[:k])
+    if k > 40:
+        raise ValueError("at most 40 leading digits are supported")
+
+    with decimal.localcontext() as ctx:
+        ctx.prec = k + len(str(n)) + 15
+        log = log10_factorial(n, ctx.prec)
+        frac = log - int(log)
+        return int(decimal.Decimal(10) ** (frac + k - 1))
+
+
+def factorial_queries(n, p=10**9 + 7, k=10):
+    return {
+        "trailing_zeros": trailing_zeros(n),
+        "digit_count": digit_count(n),
+        "leading_digits": leading_digits(n, min(k, digit_count(n))),
+        "mod_p": (p, factorial_mod(n, p)),
+    }
+
+
+# ===============================
+# Digit Grid Bitmap
+# ===============================
+# The result is drawn as one image: each digit is a 5x7 glyph inside a
+# CELL_H x CELL_W cell (0 = gap, 1 = cell, 2 = ink), wrapped at
+# GRID_COLS digits per row; only GRID_MAX_ROWS rows are shown at once.
+GRID_COLS = 40
+GRID_MAX_ROWS = 8
+CELL_W, CELL_H = 9, 11
+
+_GLYPHS = [
+    [".###.", "#...#", "#..##", "#.#.#", "##..#", "#...#", ".###."],
+    ["..#..", ".##..", "..#..", "..#..", "..#..", "..#..", ".###."],
+    [".###.", "#...#", "....#", "...#.", "..#..", ".#...", "#####"],
+    ["#####", "...#.", "..#..", "...#.", "....#", "#...#", ".###."],
+    ["...#.", "..##.", ".#.#.", "#..#.", "#####", "...#.", "...#."],
+    ["#####", "#....", "####.", "....#", "....#", "#...#", ".###."],
+    ["..##.", ".#...", "#....", "####.", "#...#", "#...#", ".###."],
+    ["#####", "....#", "...#.", "..#..", ".#...", ".#...", ".#..."],
+    [".###.", "#...#", "#...#", ".###.", "#...#", "#...#", ".###."],
+    [".###.", "#...#", "#...#", ".####", "....#", "...#.", ".##.."],
+]
+
+
+def _glyph_atlas():
+    # atlas[d] is the cell bitmap of digit d; atlas[10] is an empty slot
+    atlas = np.zeros((11, CELL_H, CELL_W), dtype=np.uint8)
+    for d, rows in enumerate(_GLYPHS):
+        atlas[d, 1:-1, 1:-1] = 1
+        atlas[d, 2:9, 2:7] = [[2 if c == "#" else 1 for c in row] for row in rows]
+    return atlas
+
+
+GLYPH_ATLAS = _glyph_atlas()
+
+
+def digit_grid(digits, row0, rows):
+    # bitmap of grid rows row0 .. row0+rows-1
+    codes = np.full(rows * GRID_COLS, 10, dtype=np.intp)
+    part = digits[row0 * GRID_COLS:(row0 + rows) * GRID_COLS]
+    codes[:len(part)] = part
+    cells = GLYPH_ATLAS[codes].reshape(rows, GRID_COLS, CELL_H, CELL_W)
+    return cells.transpose(0, 2, 1, 3).reshape(rows * CELL_H, GRID_COLS * CELL_W)
+
+
 # ===============================
 # Visualization Controller
 # ===============================
 class FactorialVisualizer:
-    def __init__(self, n):
-        self.steps = factorial_steps(n)
+    def __init__(self, n, trace="digit"):
+        self.n = n
+        self.steps = factorial_steps(n, trace)
         self.idx = 0
+        self.answers = None     # factorial_queries(n), shown with "a"
 
         self.fig, self.ax = plt.subplots(figsize=(14, 7))
         self.fig.subplots_adjust(bottom=0.22)
@@ -130,6 +500,7 @@ class FactorialVisualizer:
         # Keyboard event
         self.fig.canvas.mpl_connect('key_press_event', self.on_key)
 
+        self.build_scene()
         self.draw()
 
     # ==========================
@@ -150,60 +521,111 @@ class FactorialVisualizer:
             self.next()
         elif event.key == "left":
             self.prev()
+        elif event.key == "a":
+            self.toggle_answers()
+
+    def toggle_answers(self):
+        self.answers = None if self.answers else factorial_queries(self.n)
+        self.draw()
 
     # ==========================
     # Rendering Logic
     # ==========================
+    def build_scene(self):
+        # every artist is created once; draw() only updates them
+        self.ax.axis("off")
+        text = dict(ha="center", transform=self.ax.transAxes)
+        self.message_text = self.ax.text(0.5, 0.93, "", fontsize=14, color="#00E5FF", **text)
+        self.expression_text = self.ax.text(0.5, 0.87, "", fontsize=16, color="#98FB98", **text)
+        self.multiplier_text = self.ax.text(0.5, 0.80, "", fontsize=14, color="yellow", **text)
+        self.carry_text = self.ax.text(0.5, 0.75, "", fontsize=14, color="#FFD369", **text)
+        self.final_text = self.ax.text(0.5, 0.02, "", fontsize=22, color="#00FF88", **text)
+        self.answers_text = self.ax.text(0.99, 0.99, "", ha="right", va="top",
+                                         transform=self.ax.transAxes)
+
+        # Result digits: one image, one highlight patch
+        self.grid_ax = self.fig.add_axes([0.05, 0.36, 0.9, 0.30])
+        self.grid_ax.set_facecolor("#111")
+        for spine in self.grid_ax.spines.values():
+            spine.set_visible(False)
+        self.grid_ax.set_xticks([])
+        self.grid_ax.tick_params(axis="y", colors="#999", labelsize=8, length=0)
+
+        cmap = ListedColormap(["#111111", "#393E46", "white"])
+        self.grid_image = self.grid_ax.imshow(digit_grid([], 0, 1), cmap=cmap, vmin=0, vmax=2,
+                                              interpolation="nearest", extent=(0, GRID_COLS, 1, 0))
+        self.grid_ax.set_anchor("N")
+        self.highlight = patches.Rectangle((0, 0), 1, 1, facecolor="#007F5F", alpha=0.6,
+                                           edgecolor="white", linewidth=2, visible=False)
+        self.grid_ax.add_patch(self.highlight)
+
+        self.grid_state = None      # (digits, first row) currently in the image
+
+    def render_grid(self, digits, active):
+        total_rows = max(1, -(-len(digits) // GRID_COLS))
+        rows = min(total_rows, GRID_MAX_ROWS)
+
+        # window of rows around the active digit (or the most significant end)
+        focus = active if active is not None else len(digits) - 1
+        row0 = min(max(0, focus // GRID_COLS - rows // 2), total_rows - rows)
+
+        if self.grid_state is None or self.grid_state[1] != row0 or self.grid_state[0] != digits:
+            self.grid_image.set_data(digit_grid(digits, row0, rows))
+            self.grid_image.set_extent((0, GRID_COLS, row0 + rows, row0))
+            self.grid_ax.set_xlim(0, GRID_COLS)
+            self.grid_ax.set_ylim(row0 + rows, row0)
+            ticks = range(row0, row0 + rows)
+            self.grid_ax.set_yticks([r + 0.5 for r in ticks])
+            self.grid_ax.set_yticklabels([f"[{r * GRID_COLS}]" for r in ticks])
+            self.grid_state = (list(digits), row0)
+
+        if active is None:
+            self.highlight.set_visible(False)
+        else:
+            self.highlight.set_xy((active % GRID_COLS, active // GRID_COLS))
+            self.highlight.set_visible(True)
+
     def draw(self):
-        self.ax.clear()
         step = self.steps[self.idx]
 
-        # Header
-        # self.ax.text(0.5, 1.05, f"STEP {self.idx + 1}/{len(self.steps)} - {step['status'].upper()}",
-        #              ha='center', fontsize=18, fontweight='bold', transform=self.ax.transAxes)
-
-        self.ax.text(0.5, 0.93, step["message"], ha="center", fontsize=14,
-                     color="#00E5FF", transform=self.ax.transAxes)
+        self.message_text.set_text(step["message"])
 
         # Expression (human multiplication style)
-        if step["expression"]:
-            self.ax.text(0.5, 0.87, f"🧠 Operation: {step['expression']}",
-                         ha="center", fontsize=16, color="#98FB98", transform=self.ax.transAxes)
+        self.expression_text.set_text(f"🧠 Operation: {step['expression']}" if step["expression"] else "")
 
         # Current Multiplier
-        if step["multiplier"]:
-            self.ax.text(0.5, 0.80, f"Multiplier: {step['multiplier']}",
-                         fontsize=14, ha="center", color="yellow", transform=self.ax.transAxes)
+        self.multiplier_text.set_text(f"Multiplier: {step['multiplier']}" if step["multiplier"] else "")
 
         # Carry
-        self.ax.text(0.5, 0.75, f"Carry: {step['carry']}",
-                     fontsize=14, ha="center", color="#FFD369", transform=self.ax.transAxes)
-
-        # Draw result digits
-        digits = step["result"]
-        start_x = 0.05
-        spacing = 0.065
+        self.carry_text.set_text(f"Carry: {step['carry']}")
 
-        for i, d in enumerate(digits):
-            x = start_x + i * spacing
-            box_color = "#007F5F" if step["digit"] == i else "#393E46"
-
-            rect = patches.Rectangle((x, 0.45), 0.055, 0.10, edgecolor="white",
-                                     facecolor=box_color, linewidth=2)
-            self.ax.add_patch(rect)
-
-            self.ax.text(x + 0.027, 0.495, str(d), ha="center", fontsize=16, color="white")
-
-            # Index with spacing improvement ⬇
-            self.ax.text(x + 0.027, 0.42, f"[{i}]", fontsize=9, ha="center", color="#999")
+        # Draw result digits (index 0 = least significant, as stored)
+        digits = step_digits(step)
+        self.render_grid(digits, step["digit"])
 
         # Final display
         if step["status"] == "done":
             final = ''.join(map(str, digits[::-1]))
-            self.ax.text(0.5, 0.20, f"🎉 Final Result:\n{final}",
-                         ha="center", fontsize=22, color="#00FF88")
+            if len(final) > 48:
+                final = f"{final[:24]}…{final[-12:]} ({len(final)} digits)"
+            self.final_text.set_text(f"🎉 Final Result:\n{final}")
+        else:
+            self.final_text.set_text("")
+
+        # Analytic answers (no expansion needed)
+        if self.answers:
+            a = self.answers
+            p, mod = a["mod_p"]
+            self.answers_text.set_text(f"{self.n}! without expanding\n"
+                                       f"Trailing zeros: {a['trailing_zeros']}\n"
+                                       f"Digits: {a['digit_count']}\n"
+                                       f"Leading digits: {a['leading_digits']}\n"
+                                       f"mod {p}: {mod}")
+            self.answers_text.set(fontsize=11, color="#FFD369", family="monospace")
+        else:
+            self.answers_text.set_text("a: analytic answers")
+            self.answers_text.set(fontsize=9, color="#999", family="sans-serif")
 
-        self.ax.axis("off")
         self.fig.canvas.draw_idle()
 
 